@@ -10,18 +10,26 @@ This script performs comprehensive performance testing including:
 """
 
 import asyncio
+import itertools
 import aiohttp
 import numpy as np
+import orjson
 import time
 import json
 from datetime import datetime
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Optional
 from dataclasses import dataclass, asdict
-from collections import defaultdict
-import statistics
 
 
-@dataclass
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _dumps(payload: Any) -> bytes:
+    """Serialize a request payload with orjson, accepting numpy scalars and arrays"""
+    return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+@dataclass(slots=True, frozen=True)
 class PerformanceMetrics:
     """Container for performance metrics"""
     total_requests: int
@@ -40,15 +48,49 @@ class PerformanceMetrics:
         return asdict(self)
 
 
-@dataclass
+def _metrics_from_latencies(latencies: np.ndarray, total: int,
+                            total_time: float) -> PerformanceMetrics:
+    """Build PerformanceMetrics from successful-request latencies (nearest-rank percentiles)"""
+    successful = len(latencies)
+    if successful:
+        arr = np.asarray(latencies, dtype=np.float64)
+        # Partial sort in O(n): only the three order statistics we report are placed
+        kth = np.minimum(
+            np.array([successful // 2, int(successful * 0.95), int(successful * 0.99)]),
+            successful - 1
+        )
+        p50, p95, p99 = np.partition(arr, kth)[kth]
+        min_latency, avg_latency, max_latency = arr.min(), arr.mean(), arr.max()
+    else:
+        p50 = p95 = p99 = min_latency = avg_latency = max_latency = 0
+
+    return PerformanceMetrics(
+        total_requests=total,
+        successful_requests=successful,
+        failed_requests=total - successful,
+        total_time_seconds=total_time,
+        min_latency_ms=float(min_latency),
+        avg_latency_ms=float(avg_latency),
+        median_latency_ms=float(p50),
+        p95_latency_ms=float(p95),
+        p99_latency_ms=float(p99),
+        max_latency_ms=float(max_latency),
+        throughput_rps=successful / total_time if total_time > 0 else 0
+    )
+
+
+@dataclass(slots=True)
 class TestConfig:
     """Configuration for performance tests"""
     api_base_url: str = "http://127.0.0.1:8000"
     num_training_series: int = 10
     training_points_per_series: int = 100
     num_concurrent_predictions: int = 200
+    predict_batch_size: int = 64
+    max_in_flight_requests: int = 500
     num_determinism_tests: int = 5
     timeout_seconds: int = 30
+    random_seed: Optional[int] = None
 
 
 class PerformanceTester:
@@ -59,10 +101,23 @@ class PerformanceTester:
         self.session = None
         self.trained_series: Dict[str, Dict[str, Any]] = {}
         self.latencies: List[float] = []
+        self._rng = np.random.default_rng(config.random_seed)
+        self._series_names: List[str] = []
+        self._series_mean: np.ndarray = np.empty(0, dtype=np.float64)
+        self._series_std: np.ndarray = np.empty(0, dtype=np.float64)
 
     async def __aenter__(self):
         timeout = aiohttp.ClientTimeout(total=self.config.timeout_seconds)
-        self.session = aiohttp.ClientSession(timeout=timeout)
+        # Default connector caps at 100 connections, which queues requests client-side
+        connector = aiohttp.TCPConnector(
+            limit=0,
+            limit_per_host=0,
+            ttl_dns_cache=300,
+            keepalive_timeout=60
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector, timeout=timeout, headers=JSON_HEADERS
+        )
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -73,9 +128,9 @@ class PerformanceTester:
                               num_points: int = 100) -> Tuple[List[int], List[float]]:
         """Generate synthetic training data with normal distribution"""
         base_timestamp = int(time.time()) - num_points * 3600
-        timestamps = [base_timestamp + i * 3600 for i in range(num_points)]
-        values = np.random.normal(mean, std, num_points).tolist()
-        return timestamps, values
+        timestamps = base_timestamp + np.arange(num_points, dtype=np.int64) * 3600
+        values = self._rng.normal(mean, std, num_points)
+        return timestamps.tolist(), values.tolist()
 
     def generate_test_point(self, series_id: str, is_anomaly: bool = False) -> Tuple[int, float]:
         """Generate a single test point (normal or anomalous)"""
@@ -86,9 +141,9 @@ class PerformanceTester:
         timestamp = int(time.time())
 
         if is_anomaly:
-            value = mean + 3.5 * std + np.random.uniform(0, std)
+            value = mean + 3.5 * std + self._rng.uniform(0, std)
         else:
-            value = np.random.normal(mean, std)
+            value = self._rng.normal(mean, std)
 
         return timestamp, value
 
@@ -97,7 +152,7 @@ class PerformanceTester:
         url = f"{self.config.api_base_url}/healthcheck"
         async with self.session.get(url) as response:
             if response.status == 200:
-                return await response.json()
+                return orjson.loads(await response.read())
             else:
                 return {"error": f"Status {response.status}"}
 
@@ -105,22 +160,19 @@ class PerformanceTester:
                          values: List[float]) -> Tuple[bool, float, Dict[str, Any]]:
         """Train a single model and return success status, latency, and response"""
         url = f"{self.config.api_base_url}/fit/{series_id}"
-        payload = {
-            "timestamps": timestamps,
-            "values": values
-        }
+        body = _dumps({"timestamps": timestamps, "values": values})
 
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
-            async with self.session.post(url, json=payload) as response:
-                latency_ms = (time.time() - start_time) * 1000
+            async with self.session.post(url, data=body) as response:
+                latency_ms = (time.perf_counter() - start_time) * 1000
                 if response.status == 200:
-                    result = await response.json()
+                    result = orjson.loads(await response.read())
                     return True, latency_ms, result
                 else:
                     return False, latency_ms, {"error": f"Status {response.status}"}
         except Exception as e:
-            latency_ms = (time.time() - start_time) * 1000
+            latency_ms = (time.perf_counter() - start_time) * 1000
             return False, latency_ms, {"error": str(e)}
 
     async def predict(self, series_id: str, timestamp: int, value: float,
@@ -130,22 +182,37 @@ class PerformanceTester:
         if version:
             url += f"?version={version}"
 
-        payload = {
-            "timestamp": str(timestamp),
-            "value": value
-        }
+        body = _dumps({"timestamp": timestamp, "value": value})
 
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
-            async with self.session.post(url, json=payload) as response:
-                latency_ms = (time.time() - start_time) * 1000
+            async with self.session.post(url, data=body) as response:
+                latency_ms = (time.perf_counter() - start_time) * 1000
                 if response.status == 200:
-                    result = await response.json()
+                    result = orjson.loads(await response.read())
                     return True, latency_ms, result
                 else:
                     return False, latency_ms, {"error": f"Status {response.status}"}
         except Exception as e:
-            latency_ms = (time.time() - start_time) * 1000
+            latency_ms = (time.perf_counter() - start_time) * 1000
+            return False, latency_ms, {"error": str(e)}
+
+    async def predict_batch(self, items: List[Dict[str, Any]]) -> Tuple[bool, float, Dict[str, Any]]:
+        """Score many (series_id, timestamp, value) items in a single request"""
+        url = f"{self.config.api_base_url}/predict_batch"
+        body = _dumps({"items": items})
+
+        start_time = time.perf_counter()
+        try:
+            async with self.session.post(url, data=body) as response:
+                latency_ms = (time.perf_counter() - start_time) * 1000
+                if response.status == 200:
+                    result = orjson.loads(await response.read())
+                    return True, latency_ms, result
+                else:
+                    return False, latency_ms, {"error": f"Status {response.status}"}
+        except Exception as e:
+            latency_ms = (time.perf_counter() - start_time) * 1000
             return False, latency_ms, {"error": str(e)}
 
     async def test_concurrent_training(self) -> PerformanceMetrics:
@@ -169,15 +236,17 @@ class PerformanceTester:
                 'std': std
             }
 
-        start_time = time.time()
+        start_time = time.perf_counter()
         tasks = [
             self.train_model(series_id, data['timestamps'], data['values'])
             for series_id, data in training_data.items()
         ]
         results = await asyncio.gather(*tasks)
-        total_time = time.time() - start_time
+        total_time = time.perf_counter() - start_time
 
-        latencies = []
+        latencies = np.fromiter(
+            (latency for success, latency, _ in results if success), dtype=np.float64
+        )
         successful = 0
         failed = 0
 
@@ -185,7 +254,6 @@ class PerformanceTester:
             series_id = f"sensor_{i:03d}"
             if success:
                 successful += 1
-                latencies.append(latency)
                 self.trained_series[series_id] = {
                     **training_data[series_id],
                     'version': response.get('version'),
@@ -196,19 +264,16 @@ class PerformanceTester:
                 failed += 1
                 print(f"✗ {series_id}: FAILED - {response.get('error', 'Unknown error')}")
 
-        metrics = PerformanceMetrics(
-            total_requests=len(results),
-            successful_requests=successful,
-            failed_requests=failed,
-            total_time_seconds=total_time,
-            min_latency_ms=min(latencies) if latencies else 0,
-            avg_latency_ms=statistics.mean(latencies) if latencies else 0,
-            median_latency_ms=statistics.median(latencies) if latencies else 0,
-            p95_latency_ms=np.percentile(latencies, 95) if latencies else 0,
-            p99_latency_ms=np.percentile(latencies, 99) if latencies else 0,
-            max_latency_ms=max(latencies) if latencies else 0,
-            throughput_rps=successful / total_time if total_time > 0 else 0
+        # Index trained series parameters for vectorized test point generation
+        self._series_names = list(self.trained_series.keys())
+        self._series_mean = np.array(
+            [self.trained_series[s]['mean'] for s in self._series_names], dtype=np.float64
         )
+        self._series_std = np.array(
+            [self.trained_series[s]['std'] for s in self._series_names], dtype=np.float64
+        )
+
+        metrics = _metrics_from_latencies(latencies, len(results), total_time)
 
         print(f"\nTraining Results:")
         print(f"  Success Rate: {successful}/{len(results)} ({100*successful/len(results):.1f}%)")
@@ -218,8 +283,15 @@ class PerformanceTester:
 
         return metrics
 
-    async def test_concurrent_inference(self) -> Tuple[PerformanceMetrics, Dict[str, Any]]:
-        """Test concurrent inference with mixed normal and anomalous points"""
+    async def test_concurrent_inference(
+        self
+    ) -> Tuple[PerformanceMetrics, Dict[str, Any], Dict[str, Any]]:
+        """
+        Test concurrent inference with mixed normal and anomalous points.
+
+        Cases are packed into /predict_batch requests, so latency and throughput are
+        measured per HTTP request; case throughput is reported separately.
+        """
         print(f"\n{'='*80}")
         print(f"CONCURRENT INFERENCE TEST - {self.config.num_concurrent_predictions} parallel predictions")
         print(f"{'='*80}")
@@ -227,32 +299,67 @@ class PerformanceTester:
         if not self.trained_series:
             raise ValueError("No trained models available. Run training test first.")
 
-        # Generate test cases (70% normal, 30% anomalous)
-        test_cases = []
-        series_ids = list(self.trained_series.keys())
+        # Generate test cases (70% normal, 30% anomalous) in one vectorized pass
+        num_cases = self.config.num_concurrent_predictions
+        positions = np.arange(num_cases)
+        idx = positions % len(self._series_names)
+        is_anomaly = (positions % 10) < 3  # 30% anomalous
+        mean = self._series_mean[idx]
+        std = self._series_std[idx]
+        normal_values = self._rng.normal(mean, std)
+        anomaly_values = mean + 3.5 * std + self._rng.uniform(0, std)
+        values = np.where(is_anomaly, anomaly_values, normal_values)
+        timestamp = int(time.time())
 
-        for i in range(self.config.num_concurrent_predictions):
-            series_id = series_ids[i % len(series_ids)]
-            is_anomaly = (i % 10) < 3  # 30% anomalous
-            timestamp, value = self.generate_test_point(series_id, is_anomaly)
-            test_cases.append({
-                'series_id': series_id,
+        test_cases = [
+            {
+                'series_id': self._series_names[i],
                 'timestamp': timestamp,
                 'value': value,
-                'expected_anomaly': is_anomaly
-            })
-
-        # Make predictions concurrently
-        start_time = time.time()
-        tasks = [
-            self.predict(case['series_id'], case['timestamp'], case['value'])
-            for case in test_cases
+                'expected_anomaly': anomaly
+            }
+            for i, value, anomaly in zip(idx.tolist(), values.tolist(), is_anomaly.tolist())
         ]
-        results = await asyncio.gather(*tasks)
-        total_time = time.time() - start_time
 
-        # Process results
-        latencies = []
+        # Make predictions concurrently, packing test cases into batched requests
+        cases_iter = iter(test_cases)
+        batches = []
+        while batch := list(itertools.islice(cases_iter, self.config.predict_batch_size)):
+            batches.append(batch)
+
+        # Bound in-flight requests and collect responses as they complete, carrying
+        # the batch index so out-of-order completions pair with their test cases
+        semaphore = asyncio.Semaphore(self.config.max_in_flight_requests)
+
+        async def bounded_predict_batch(index: int, batch: List[Dict[str, Any]]):
+            async with semaphore:
+                return index, await self.predict_batch([
+                    {'series_id': case['series_id'], 'timestamp': case['timestamp'], 'value': case['value']}
+                    for case in batch
+                ])
+
+        start_time = time.perf_counter()
+        batch_results = [None] * len(batches)
+        for completed in asyncio.as_completed(
+            [bounded_predict_batch(index, batch) for index, batch in enumerate(batches)]
+        ):
+            index, result = await completed
+            batch_results[index] = result
+        total_time = time.perf_counter() - start_time
+
+        # Unpack batch responses back into per-case results
+        results = []
+        for batch, (success, latency, response) in zip(batches, batch_results):
+            if success:
+                for anomaly, model_version in zip(response['anomalies'], response['model_versions']):
+                    results.append((True, latency, {'anomaly': anomaly, 'model_version': model_version}))
+            else:
+                results.extend((False, latency, response) for _ in batch)
+
+        # One latency per HTTP request: every case in a batch shares its request's latency
+        latencies = np.fromiter(
+            (latency for success, latency, _ in batch_results if success), dtype=np.float64
+        )
         successful = 0
         failed = 0
         correct_predictions = 0
@@ -261,7 +368,6 @@ class PerformanceTester:
         for i, (success, latency, response) in enumerate(results):
             if success:
                 successful += 1
-                latencies.append(latency)
 
                 # Check prediction correctness
                 predicted_anomaly = response.get('anomaly', False)
@@ -274,20 +380,14 @@ class PerformanceTester:
             else:
                 failed += 1
 
-        # Calculate metrics
-        metrics = PerformanceMetrics(
-            total_requests=len(results),
-            successful_requests=successful,
-            failed_requests=failed,
-            total_time_seconds=total_time,
-            min_latency_ms=min(latencies) if latencies else 0,
-            avg_latency_ms=statistics.mean(latencies) if latencies else 0,
-            median_latency_ms=statistics.median(latencies) if latencies else 0,
-            p95_latency_ms=np.percentile(latencies, 95) if latencies else 0,
-            p99_latency_ms=np.percentile(latencies, 99) if latencies else 0,
-            max_latency_ms=max(latencies) if latencies else 0,
-            throughput_rps=successful / total_time if total_time > 0 else 0
-        )
+        # Calculate metrics per HTTP request, and case counts separately
+        metrics = _metrics_from_latencies(latencies, len(batch_results), total_time)
+        case_stats = {
+            'batch_size': self.config.predict_batch_size,
+            'total_cases': len(results),
+            'successful_cases': successful,
+            'cases_per_second': successful / total_time if total_time > 0 else 0
+        }
 
         validation_results = {
             'correct_predictions': correct_predictions,
@@ -296,13 +396,13 @@ class PerformanceTester:
         }
 
         print(f"\nInference Results:")
-        print(f"  Success Rate: {successful}/{len(results)} ({100*successful/len(results):.1f}%)")
+        print(f"  Success Rate: {successful}/{len(results)} cases in {metrics.successful_requests}/{metrics.total_requests} requests")
         print(f"  Total Time: {total_time:.2f}s")
-        print(f"  Throughput: {metrics.throughput_rps:.2f} requests/sec")
-        print(f"  Latency - Avg: {metrics.avg_latency_ms:.2f}ms, P95: {metrics.p95_latency_ms:.2f}ms, P99: {metrics.p99_latency_ms:.2f}ms")
+        print(f"  Throughput: {metrics.throughput_rps:.2f} requests/sec ({case_stats['cases_per_second']:.2f} cases/sec, batch size {self.config.predict_batch_size})")
+        print(f"  Per-Request Latency - Avg: {metrics.avg_latency_ms:.2f}ms, P95: {metrics.p95_latency_ms:.2f}ms, P99: {metrics.p99_latency_ms:.2f}ms")
         print(f"  Prediction Accuracy: {correct_predictions}/{successful} ({100*validation_results['accuracy']:.1f}%)")
 
-        return metrics, validation_results
+        return metrics, validation_results, case_stats
 
     async def test_determinism(self) -> Dict[str, Any]:
         """Test that same inputs produce same outputs"""
@@ -356,7 +456,9 @@ class PerformanceTester:
 
         # Run tests
         training_metrics = await self.test_concurrent_training()
-        inference_metrics, validation_results = await self.test_concurrent_inference()
+        inference_metrics, validation_results, inference_cases = (
+            await self.test_concurrent_inference()
+        )
         determinism_results = await self.test_determinism()
 
         # Get post-test metrics
@@ -370,11 +472,13 @@ class PerformanceTester:
                 'api_base_url': self.config.api_base_url,
                 'num_training_series': self.config.num_training_series,
                 'num_concurrent_predictions': self.config.num_concurrent_predictions,
+                'predict_batch_size': self.config.predict_batch_size,
                 'timestamp': datetime.now().isoformat()
             },
             'baseline_metrics': baseline_metrics,
             'training_performance': training_metrics.to_dict(),
             'inference_performance': inference_metrics.to_dict(),
+            'inference_cases': inference_cases,
             'validation': validation_results,
             'determinism': determinism_results,
             'post_test_metrics': post_test_metrics
@@ -392,7 +496,8 @@ def generate_markdown_report(report: Dict[str, Any]) -> str:
 
     md.append("\n## Test Configuration\n")
     md.append(f"- Training Series: {report['test_config']['num_training_series']}")
-    md.append(f"- Concurrent Predictions: {report['test_config']['num_concurrent_predictions']}\n")
+    md.append(f"- Concurrent Predictions: {report['test_config']['num_concurrent_predictions']}")
+    md.append(f"- Predictions per /predict_batch Request: {report['test_config']['predict_batch_size']}\n")
 
     md.append("\n## Training Performance\n")
     training = report['training_performance']
@@ -410,11 +515,12 @@ def generate_markdown_report(report: Dict[str, Any]) -> str:
 
     md.append("\n## Inference Performance\n")
     inference = report['inference_performance']
-    md.append(f"- **Total Requests:** {inference['total_requests']}")
+    cases = report['inference_cases']
+    md.append(f"- **Total Requests:** {inference['total_requests']} /predict_batch requests of up to {cases['batch_size']} predictions")
     md.append(f"- **Success Rate:** {inference['successful_requests']}/{inference['total_requests']} ({100*inference['successful_requests']/inference['total_requests']:.1f}%)")
     md.append(f"- **Total Time:** {inference['total_time_seconds']:.2f}s")
-    md.append(f"- **Throughput:** {inference['throughput_rps']:.2f} req/s")
-    md.append(f"\n**Client-Side End-to-End Latency (includes network + queueing + processing):**")
+    md.append(f"- **Throughput:** {inference['throughput_rps']:.2f} req/s ({cases['cases_per_second']:.2f} predictions/s)")
+    md.append(f"\n**Client-Side End-to-End Latency per /predict_batch Request (includes network + queueing + processing):**")
     md.append(f"- Min: {inference['min_latency_ms']:.2f}ms")
     md.append(f"- Avg: {inference['avg_latency_ms']:.2f}ms")
     md.append(f"- Median: {inference['median_latency_ms']:.2f}ms")
@@ -451,7 +557,7 @@ def generate_markdown_report(report: Dict[str, Any]) -> str:
     md.append("\n## Summary\n")
     md.append(f"The API successfully handled:")
     md.append(f"- {training['successful_requests']} concurrent training requests with {training['throughput_rps']:.2f} req/s throughput")
-    md.append(f"- {inference['successful_requests']} concurrent inference requests with {inference['throughput_rps']:.2f} req/s throughput")
+    md.append(f"- {cases['successful_cases']} predictions in {inference['successful_requests']} concurrent /predict_batch requests with {inference['throughput_rps']:.2f} req/s ({cases['cases_per_second']:.2f} predictions/s) throughput")
     md.append(f"- Maintained {100*validation['accuracy']:.1f}% prediction accuracy under load")
     md.append(f"- Demonstrated {'deterministic' if determinism['is_deterministic'] else 'non-deterministic'} behavior")
 
@@ -466,6 +572,8 @@ async def main():
     parser.add_argument('--url', default='http://127.0.0.1:8000', help='API base URL')
     parser.add_argument('--training-series', type=int, default=1000, help='Number of series to train')
     parser.add_argument('--predictions', type=int, default=1000, help='Number of concurrent predictions')
+    parser.add_argument('--batch-size', type=int, default=64, help='Predictions packed per /predict_batch request')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed for synthetic data')
     parser.add_argument('--output', default='performance_report.md', help='Output report file')
     parser.add_argument('--json-output', default='performance_report.json', help='JSON output file')
 
@@ -474,7 +582,9 @@ async def main():
     config = TestConfig(
         api_base_url=args.url,
         num_training_series=args.training_series,
-        num_concurrent_predictions=args.predictions
+        num_concurrent_predictions=args.predictions,
+        predict_batch_size=args.batch_size,
+        random_seed=args.seed
     )
 
     async with PerformanceTester(config) as tester:
@@ -507,5 +617,13 @@ async def main():
 
 
 if __name__ == '__main__':
+    # uvloop speeds up socket dispatch under heavy concurrency; it is POSIX-only,
+    # so Windows (or environments without it) fall back to the default loop
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     exit_code = asyncio.run(main())
     exit(exit_code)
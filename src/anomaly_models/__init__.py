@@ -1,12 +1,24 @@
 """
- Anomaly models package.
- """
-from src.anomaly_models.model_factory import ModelFactory
-from src.anomaly_models.statistical_model import StatisticalAnomalyModel
-from src.anomaly_models.sklearn_model import SklearnAnomalyModel
-
-__all__ = [
-    "ModelFactory",
-   "StatisticalAnomalyModel",
-   "SklearnAnomalyModel",
-]
+Anomaly models package.
+
+Exports are resolved lazily (PEP 562), so importing one model module does not
+pull in every model implementation and its dependencies.
+"""
+import importlib
+
+_EXPORTS = {
+    "ModelFactory": "src.anomaly_models.model_factory",
+    "StatisticalAnomalyModel": "src.anomaly_models.statistical_model",
+    "SklearnAnomalyModel": "src.anomaly_models.sklearn_model",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
@@ -2,19 +2,41 @@
 Base interface for anomaly detection models.
 """
 from abc import ABC, abstractmethod
-from src.models.schemas import TimeSeries, DataPoint
+from typing import Optional
+import numpy as np
+from src.models.schemas import TimeSeries, TimeSeriesArray
 
 
 class BaseAnomalyModel(ABC):
     """Interface for different model types."""
 
+    __slots__ = ()
+
     @abstractmethod
-    def fit(self, data: TimeSeries) -> "BaseAnomalyModel":
+    def fit(self, data: TimeSeries | TimeSeriesArray) -> "BaseAnomalyModel":
         """Trains the model with historical data."""
 
     @abstractmethod
-    def predict(self, data_point: DataPoint) -> bool:
-        """Detects if a point is anomalous."""
+    def fit_values(self, values: np.ndarray) -> "BaseAnomalyModel":
+        """Trains the model directly on an array of values."""
+
+    @abstractmethod
+    def predict(self, value: float) -> bool:
+        """Detects if a point's value is anomalous."""
+
+    @abstractmethod
+    def predict_batch(self, values: np.ndarray) -> np.ndarray:
+        """Detects anomalies for an array of values, returning a boolean mask."""
+
+    @property
+    def upper_bound(self) -> Optional[float]:
+        """Score above which values are anomalous, for single-threshold models; else None."""
+        return None
+
+    @property
+    def lower_bound(self) -> Optional[float]:
+        """Lower edge of the normal band, for single-threshold models; else None."""
+        return None
 
     @abstractmethod
     def save(self) -> bytes:
@@ -22,7 +44,7 @@ class BaseAnomalyModel(ABC):
 
     @abstractmethod
     def load(self, data: bytes) -> "BaseAnomalyModel":
-        """Loads the serialized model."""
+        """Loads the serialized model; large files may arrive as a read-only mmap."""
 
     @abstractmethod
     def is_fitted(self) -> bool:
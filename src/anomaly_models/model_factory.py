@@ -17,8 +17,8 @@ class ModelFactory:  # pylint: disable=too-few-public-methods
     @classmethod
     def create(cls, model_type: str, **kwargs) -> BaseAnomalyModel:
         """Instantiates model with its specific parameters."""
-        if model_type not in cls._registry:
+        model_class = cls._registry.get(model_type)
+        if model_class is None:
             raise ValueError(f"Type {model_type} not supported")
 
-        model_class = cls._registry[model_type]
         return model_class(**kwargs)
@@ -1,7 +1,8 @@
 """
 Mock sklearn model for anomaly detection.
 """
-from src.models.schemas import TimeSeries, DataPoint
+import numpy as np
+from src.models.schemas import TimeSeries, TimeSeriesArray
 from src.anomaly_models.base_model import BaseAnomalyModel
 
 
@@ -12,24 +13,38 @@ class SklearnAnomalyModel(BaseAnomalyModel):
         self.contamination = contamination
         self.n_estimators = n_estimators
         self._is_fitted = False
+        self._score_threshold: float | None = None
         # Mock: from sklearn.ensemble import IsolationForest
         # Mock: self.model = IsolationForest(
         #     contamination=contamination,
         #     n_estimators=n_estimators
         # )
 
-    def fit(self, data: TimeSeries) -> "SklearnAnomalyModel":
+    def fit(self, data: TimeSeries | TimeSeriesArray) -> "SklearnAnomalyModel":
         """Simulates sklearn model training."""
-        # Mock: valores = [[d.value] for d in data.data]
-        # Mock: self.model.fit(valores)
+        return self.fit_values(data.values_array)
+
+    def fit_values(self, values: np.ndarray) -> "SklearnAnomalyModel":
+        """Simulates sklearn model training on an array of values."""
+        # Mock: values = values.reshape(-1, 1)
+        # Mock: self.model.fit(values)
+        # Mock: scores are computed once here so inference is a single compare
+        # Mock: self._score_threshold = float(
+        #     np.quantile(self.model.decision_function(values), self.contamination)
+        # )
         self._is_fitted = True
         return self
 
-    def predict(self, data_point: DataPoint) -> bool:
+    def predict(self, value: float) -> bool:
         """Simulates sklearn prediction."""
-        # Mock: prediction = self.model.predict([[data_point.value]])
-        # Mock: return prediction[0] == -1 (outlier)
-        return False
+        # Single points go through the batched path to avoid per-point sklearn overhead
+        return bool(self.predict_batch(np.array([value], dtype=np.float64))[0])
+
+    def predict_batch(self, values: np.ndarray) -> np.ndarray:
+        """Simulates sklearn batch prediction."""
+        # Mock: scores = self.model.decision_function(values.reshape(-1, 1))
+        # Mock: return scores < self._score_threshold
+        return np.zeros(len(values), dtype=bool)
 
     def save(self) -> bytes:
         """Serializes using pickle."""
@@ -37,17 +52,18 @@ class SklearnAnomalyModel(BaseAnomalyModel):
             raise ValueError("Cannot serialize an unfitted model")
 
         # Mock: import pickle
+        # Mock: protocol 5 writes the forest's numpy arrays as raw buffers, not re-encoded
         # Mock: return pickle.dumps({
         #     'model': self.model,
         #     'contamination': self.contamination,
         #     'n_estimators': self.n_estimators
-        # })
+        # }, protocol=5)
         return b"mock_pickle_data"
 
     def load(self, data: bytes) -> "SklearnAnomalyModel":
         """Loads using pickle."""
         # Mock: import pickle
-        # Mock: obj = pickle.loads(data)
+        # Mock: obj = pickle.loads(data)  # data may be the storage's read-only mmap
         # Mock: self.model = obj['model']
         # Mock: self.contamination = obj['contamination']
         # Mock: self.n_estimators = obj['n_estimators']
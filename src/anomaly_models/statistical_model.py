@@ -2,56 +2,135 @@
 Statistical anomaly detection model (original implementation).
 """
 import json
+import struct
 import numpy as np
-from src.models.schemas import TimeSeries, DataPoint
+from src.models.schemas import TimeSeries, TimeSeriesArray
 from src.anomaly_models.base_model import BaseAnomalyModel
 
 
+# Binary layout: 1-byte format tag followed by threshold, mean and std as little-endian doubles
+_BINARY_FORMAT = struct.Struct("<Bddd")
+_BINARY_TAG = 1
+
+
+def _mean_std(values: np.ndarray) -> tuple[float, float]:
+    """Population mean and std, reusing the mean instead of letting np.std recompute it."""
+    mean = values.mean()
+    deviations = values - mean
+    std = np.sqrt(np.dot(deviations, deviations) / len(values))
+    return float(mean), float(std)
+
+
 class StatisticalAnomalyModel(BaseAnomalyModel):
     """Detects anomalies using mean + N standard deviations."""
 
+    __slots__ = ("_threshold", "_mean", "_std", "_upper_bound", "_lower_bound", "_is_fitted")
+
     def __init__(self, threshold: float = 3.0):
-        self.threshold = threshold
-        self.mean: float | None = None
-        self.std: float | None = None
+        self._threshold: float = threshold
+        self._mean: float | None = None
+        self._std: float | None = None
+        self._upper_bound: float | None = None
+        self._lower_bound: float | None = None
         self._is_fitted: bool = False
 
-    def fit(self, data: TimeSeries) -> "StatisticalAnomalyModel":
+    @property
+    def threshold(self) -> float:
+        """Number of standard deviations above the mean flagged as anomalous."""
+        return self._threshold
+
+    @threshold.setter
+    def threshold(self, value: float) -> None:
+        self._threshold = value
+        self._update_bounds()
+
+    @property
+    def mean(self) -> float | None:
+        """Mean of the training values."""
+        return self._mean
+
+    @mean.setter
+    def mean(self, value: float | None) -> None:
+        self._mean = None if value is None else float(value)
+        self._update_bounds()
+
+    @property
+    def std(self) -> float | None:
+        """Standard deviation of the training values."""
+        return self._std
+
+    @std.setter
+    def std(self, value: float | None) -> None:
+        self._std = None if value is None else float(value)
+        self._update_bounds()
+
+    @property
+    def upper_bound(self) -> float | None:
+        """Precomputed mean + threshold * std."""
+        return self._upper_bound
+
+    @property
+    def lower_bound(self) -> float | None:
+        """Precomputed mean - threshold * std."""
+        return self._lower_bound
+
+    def _update_bounds(self) -> None:
+        """Precomputes mean ± threshold * std so predict and plots read cached floats."""
+        if self._mean is None or self._std is None:
+            self._upper_bound = None
+            self._lower_bound = None
+        else:
+            self._upper_bound = self._mean + self._threshold * self._std
+            self._lower_bound = self._mean - self._threshold * self._std
+
+    def fit(self, data: TimeSeries | TimeSeriesArray) -> "StatisticalAnomalyModel":
         """Trains the model on the data."""
-        values_stream = [d.value for d in data.data]
+        return self.fit_values(data.values_array)
 
-        if len(values_stream) == 0:
+    def fit_values(self, values: np.ndarray) -> "StatisticalAnomalyModel":
+        """Trains the model directly on an array of values."""
+        if len(values) == 0:
             raise ValueError("Cannot train on empty time series")
 
-        self.mean = np.mean(values_stream)
-        self.std = np.std(values_stream)
+        self.mean, self.std = _mean_std(values)
         self._is_fitted = True
 
         return self
 
-    def predict(self, data_point: DataPoint) -> bool:
-        """Checks if the point is outside the configured threshold."""
-        return data_point.value > self.mean + self.threshold * self.std
+    def predict(self, value: float) -> bool:
+        """Checks if the value is outside the configured threshold."""
+        return value > self._upper_bound
+
+    def predict_batch(self, values: np.ndarray) -> np.ndarray:
+        """Checks many values against the threshold in one vectorized compare."""
+        return values > self._upper_bound
 
     def save(self) -> bytes:
-        """Serializes to JSON."""
+        """Serializes to a packed binary layout."""
         if not self._is_fitted:
             raise ValueError("Cannot serialize an unfitted model")
 
-        data = {
-            "model_type": "statistical",
-            "threshold": self.threshold,
-            "mean": self.mean,
-            "std": self.std
-        }
-        return json.dumps(data).encode('utf-8')
+        return _BINARY_FORMAT.pack(_BINARY_TAG, self.threshold, self.mean, self.std)
 
     def load(self, data: bytes) -> "StatisticalAnomalyModel":
-        """Loads from JSON."""
-        model_data = json.loads(data.decode('utf-8'))
-        self.threshold = model_data.get("threshold", 3.0)
-        self.mean = model_data["mean"]
-        self.std = model_data["std"]
+        """Loads from the packed binary layout, or from JSON for older models."""
+        # Decode fully into locals first so a bad blob never leaves the model half-loaded
+        if data[:1] == b"{":
+            model_data = json.loads(bytes(data).decode('utf-8'))
+            threshold = model_data.get("threshold", 3.0)
+            mean, std = model_data["mean"], model_data["std"]
+        else:
+            if len(data) != _BINARY_FORMAT.size:
+                raise ValueError(
+                    f"Statistical model blob is {len(data)} bytes, expected {_BINARY_FORMAT.size}"
+                )
+            tag, threshold, mean, std = _BINARY_FORMAT.unpack(data)
+            if tag != _BINARY_TAG:
+                raise ValueError(f"Unsupported statistical model format tag: {tag}")
+
+        self.threshold = threshold
+        self.mean = mean
+        self.std = std
         self._is_fitted = True
         return self
 
@@ -2,10 +2,14 @@
 Dependency injection providers for FastAPI routes.
 Uses factories to create configurable backends.
 """
-import threading
-from fastapi import Depends
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict, Optional
 from src.services.anomaly_service import AnomalyDetectionService
 from src.services.visualization_service import VisualizationService
+from src.services.batcher import PredictionBatcher
+from src.services.training_jobs import TrainingJobStore
 from src.services.base_training_service import BaseTrainingService
 from src.services.local_training_service import LocalTrainingService
 from src.services.external_training_service import ExternalTrainingService
@@ -13,97 +17,175 @@ from src.storage.base_storage import BaseModelStorage
 from src.storage.storage_factory import StorageFactory
 from src.utils.base_metrics import BaseMetricsExporter
 from src.utils.metrics_factory import MetricsFactory
-from src.config import config
-
-_model_storage_instance: BaseModelStorage | None = None
-_metrics_exporter_instance: BaseMetricsExporter | None = None
-_training_service_instance: BaseTrainingService | None = None
-
-_storage_lock = threading.Lock()
-_metrics_lock = threading.Lock()
-_training_lock = threading.Lock()
-
-
-def get_model_storage() -> BaseModelStorage:
-    """Creates singleton of configured storage."""
-    global _model_storage_instance # pylint: disable=global-statement
-
-    if _model_storage_instance is None:
-        with _storage_lock:
-            if _model_storage_instance is None:
-                if config.storage_type == "filesystem":
-                    _model_storage_instance = StorageFactory.create(
-                        "filesystem",
-                        storage_path=config.filesystem.storage_path
-                    )
-                elif config.storage_type == "s3":
-                    _model_storage_instance = StorageFactory.create(
-                        "s3",
-                        bucket_name=config.s3.bucket,
-                        prefix=config.s3.prefix
-                    )
-
-    return _model_storage_instance
-
-
-def get_metrics_exporter() -> BaseMetricsExporter:
-    """Creates singleton of configured metrics exporter."""
-    global _metrics_exporter_instance # pylint: disable=global-statement
-
-    if _metrics_exporter_instance is None:
-        with _metrics_lock:
-            if _metrics_exporter_instance is None:
-                if config.metrics_type == "memory":
-                    _metrics_exporter_instance = MetricsFactory.create(
-                        "memory",
-                        max_samples=config.memory.max_samples
-                    )
-                elif config.metrics_type == "prometheus":
-                    _metrics_exporter_instance = MetricsFactory.create(
-                        "prometheus",
-                        namespace=config.prometheus.namespace
-                    )
-
-    return _metrics_exporter_instance
-
-
-def get_training_service(
-    model_storage: BaseModelStorage = Depends(get_model_storage),
-    metrics_exporter: BaseMetricsExporter = Depends(get_metrics_exporter)
-) -> BaseTrainingService:
-    """Creates singleton of configured training service."""
-    global _training_service_instance # pylint: disable=global-statement
-
-    if _training_service_instance is None:
-        with _training_lock:
-            if _training_service_instance is None:
-                if config.training_type == "local":
-                    _training_service_instance = LocalTrainingService(
-                        model_storage=model_storage,
-                        metrics_exporter=metrics_exporter
-                    )
-                elif config.training_type == "external":
-                    _training_service_instance = ExternalTrainingService(
-                        api_url=config.external_training.api_url,
-                        metrics_exporter=metrics_exporter,
-                        api_key=config.external_training.api_key,
-                        timeout=config.external_training.timeout
-                    )
-
-    return _training_service_instance
-
-
-def get_anomaly_service(
-    model_storage: BaseModelStorage = Depends(get_model_storage),
-    metrics_exporter: BaseMetricsExporter = Depends(get_metrics_exporter),
-    training_service: BaseTrainingService = Depends(get_training_service)
-) -> AnomalyDetectionService:
-    """Injects service with abstract dependencies."""
-    return AnomalyDetectionService(model_storage, metrics_exporter, training_service)
-
-
-def get_visualization_service(
-    model_storage: BaseModelStorage = Depends(get_model_storage)
-) -> VisualizationService:
-    """Injects visualization service."""
-    return VisualizationService(model_storage)
+from src.utils.ttl_cache import TTLCache
+from src.config import get_config
+
+
+def _create_model_storage() -> BaseModelStorage:
+    """Creates the configured storage."""
+    config = get_config()
+    if config.storage_type == "filesystem":
+        return StorageFactory.create(
+            "filesystem",
+            storage_path=config.filesystem.storage_path,
+            fsync=config.filesystem.fsync
+        )
+    if config.storage_type == "s3":
+        return StorageFactory.create(
+            "s3",
+            bucket_name=config.s3.bucket,
+            prefix=config.s3.prefix
+        )
+    return None
+
+
+def _create_metrics_exporter() -> BaseMetricsExporter:
+    """Creates the configured metrics exporter."""
+    config = get_config()
+    if config.metrics_type == "memory":
+        return MetricsFactory.create(
+            "memory",
+            max_samples=config.memory.max_samples
+        )
+    if config.metrics_type == "prometheus":
+        return MetricsFactory.create(
+            "prometheus",
+            namespace=config.prometheus.namespace
+        )
+    return None
+
+
+def _create_training_service() -> BaseTrainingService:
+    """Creates the configured training service."""
+    config = get_config()
+    if config.training_type == "local":
+        return LocalTrainingService(
+            model_storage=_singleton("storage"),
+            metrics_exporter=_singleton("metrics")
+        )
+    if config.training_type == "external":
+        return ExternalTrainingService(
+            api_url=config.external_training.api_url,
+            metrics_exporter=_singleton("metrics"),
+            api_key=config.external_training.api_key,
+            timeout=config.external_training.timeout
+        )
+    return None
+
+
+def _create_anomaly_service() -> AnomalyDetectionService:
+    """Creates the service wired with the abstract dependencies."""
+    config = get_config()
+    prediction_cache = None
+    if config.prediction_cache.ttl_seconds > 0:
+        prediction_cache = TTLCache(
+            max_entries=config.prediction_cache.max_entries,
+            ttl_seconds=config.prediction_cache.ttl_seconds
+        )
+    model_cache = None
+    if config.model_cache.max_entries > 0:
+        model_cache = TTLCache(max_entries=config.model_cache.max_entries, ttl_seconds=None)
+    return AnomalyDetectionService(
+        _singleton("storage"), _singleton("metrics"), _singleton("training"),
+        prediction_cache=prediction_cache,
+        model_cache=model_cache
+    )
+
+
+def _create_visualization_service() -> VisualizationService:
+    """Creates the visualization service, with a matplotlib render pool only if configured."""
+    config = get_config()
+    workers = config.plot_rendering.process_pool_workers
+    render_pool = None
+    if workers > 0:
+        # spawn: workers must not inherit the parent's threads, locks or matplotlib state
+        render_pool = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    return VisualizationService(_singleton("storage"), render_pool=render_pool)
+
+
+def _create_prediction_batcher() -> Optional[PredictionBatcher]:
+    """Creates the /predict micro-batcher, or None when batching is disabled."""
+    config = get_config()
+    if not config.prediction_batching.enabled:
+        return None
+    return PredictionBatcher(
+        _singleton("anomaly"),
+        max_batch_size=config.prediction_batching.max_batch_size,
+        max_latency_ms=config.prediction_batching.max_latency_ms
+    )
+
+
+def _create_training_job_store() -> TrainingJobStore:
+    """Creates the registry of background training jobs."""
+    return TrainingJobStore()
+
+
+_FACTORIES: Dict[str, Callable[[], object]] = {
+    "storage": _create_model_storage,
+    "metrics": _create_metrics_exporter,
+    "training": _create_training_service,
+    "anomaly": _create_anomaly_service,
+    "visualization": _create_visualization_service,
+    "batcher": _create_prediction_batcher,
+    "jobs": _create_training_job_store,
+}
+
+
+@lru_cache(maxsize=None)
+def _singleton(kind: str) -> object:
+    """Builds each kind of dependency once per process and memoizes it."""
+    return _FACTORIES[kind]()
+
+
+def init_dependencies() -> None:
+    """Eagerly builds every singleton so no request pays for first construction."""
+    for kind in _FACTORIES:
+        _singleton(kind)
+
+
+def close_dependencies() -> None:
+    """Releases resources held by singletons that own connections or worker processes."""
+    training_service = _singleton("training")
+    if isinstance(training_service, ExternalTrainingService):
+        training_service.close()
+    _singleton("visualization").close()
+
+
+# Providers below are async so FastAPI awaits them inline instead of
+# dispatching each sync dependency call to its threadpool on every request.
+
+async def get_model_storage() -> BaseModelStorage:
+    """Returns the singleton storage."""
+    return _singleton("storage")
+
+
+async def get_metrics_exporter() -> BaseMetricsExporter:
+    """Returns the singleton metrics exporter."""
+    return _singleton("metrics")
+
+
+async def get_training_service() -> BaseTrainingService:
+    """Returns the singleton training service."""
+    return _singleton("training")
+
+
+async def get_anomaly_service() -> AnomalyDetectionService:
+    """Returns the singleton anomaly detection service."""
+    return _singleton("anomaly")
+
+
+async def get_visualization_service() -> VisualizationService:
+    """Returns the singleton visualization service."""
+    return _singleton("visualization")
+
+
+async def get_prediction_batcher() -> Optional[PredictionBatcher]:
+    """Returns the singleton prediction batcher, if batching is enabled."""
+    return _singleton("batcher")
+
+
+async def get_training_job_store() -> TrainingJobStore:
+    """Returns the singleton background training job registry."""
+    return _singleton("jobs")
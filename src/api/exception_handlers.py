@@ -2,19 +2,26 @@
 Exception handlers for the FastAPI application.
 """
 from fastapi import Request, status
-from fastapi.responses import JSONResponse
+from fastapi.exception_handlers import request_validation_exception_handler
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
 from pydantic import ValidationError as PydanticValidationError
-from src.exceptions import AnomalyDetectionError, ValidationError
-from src.utils.logger import logger
+from src.exceptions import AnomalyDetectionError, ValidationError, InvalidSeriesIdError
+from src.models.schemas import validate_series_id
+from src.utils.logger import logger, log_exc_sampled
 
 
 async def anomaly_detection_error_handler(
     request: Request,  # noqa: ARG001 pylint: disable=unused-argument
     exc: AnomalyDetectionError
 ):
-    """Handle custom anomaly detection errors."""
-    logger.error("AnomalyDetectionError: %s (status: %d)", exc.message, exc.status_code)
-    return JSONResponse(
+    """Handle custom anomaly detection errors raised from the routes."""
+    # Client errors (not found, bad input) are expected traffic; only 5xx are errors
+    if exc.status_code >= 500:
+        logger.error("%s: %s (status: %d)", type(exc).__name__, exc.message, exc.status_code)
+    else:
+        logger.warning("%s: %s (status: %d)", type(exc).__name__, exc.message, exc.status_code)
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.message}
     )
@@ -26,7 +33,7 @@ async def validation_error_handler(
 ):
     """Handle validation errors."""
     logger.warning("ValidationError: %s", exc.message)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.message, "field": exc.field}
     )
@@ -38,19 +45,33 @@ async def pydantic_validation_error_handler(
 ):
     """Handle Pydantic validation errors."""
     logger.warning("Pydantic validation error: %s", exc)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={"detail": exc.errors()}
     )
 
 
+async def request_validation_error_handler(
+    request: Request,
+    exc: RequestValidationError
+):
+    """Keep the 400 InvalidSeriesIdError contract for series_id rejected by its Path pattern."""
+    for error in exc.errors():
+        if tuple(error.get("loc", ())) == ("path", "series_id"):
+            try:
+                validate_series_id(error["input"])
+            except InvalidSeriesIdError as series_exc:
+                return await anomaly_detection_error_handler(request, series_exc)
+    return await request_validation_exception_handler(request, exc)
+
+
 async def general_exception_handler(
     request: Request,  # noqa: ARG001 pylint: disable=unused-argument
     exc: Exception
 ):
     """Catch-all handler for unexpected errors."""
-    logger.error("Unhandled exception: %s", str(exc), exc_info=True)
-    return JSONResponse(
+    log_exc_sampled(logger, exc, "Unhandled exception: %s", exc)
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={"detail": "Internal server error"}
     )
@@ -1,123 +1,219 @@
 """API routes for anomaly detection service."""
-from typing import Optional, Union
-from fastapi import APIRouter, Query, Depends, HTTPException
-from fastapi.responses import Response
+from types import MappingProxyType
+from typing import Annotated, Optional, Union
+from fastapi import APIRouter, BackgroundTasks, Query, Path, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, Response
 from src.models.schemas import (
-    TrainData, TrainDataExternal, TrainResponse, PredictData, PredictResponse,
-    HealthCheckResponse, validate_series_id
+    DataPoint, TrainData, TrainDataExternal, TrainResponse, TrainJobResponse, TrainBatchData,
+    TrainBatchResponse, PredictData, PredictResponse,
+    PredictBatchData, PredictBatchResponse, PredictSeriesBatchData,
+    PredictSeriesBatchResponse, HealthCheckResponse, SERIES_ID_PATTERN, validate_series_id
 )
 from src.services.anomaly_service import AnomalyDetectionService
 from src.services.visualization_service import VisualizationService
 from src.utils.base_metrics import BaseMetricsExporter
 from src.utils.logger import logger
+from src.services.batcher import PredictionBatcher
+from src.services.training_jobs import TrainingJobStore
 from src.api.dependencies import (
-    get_anomaly_service, get_metrics_exporter, get_visualization_service
-)
-from src.exceptions import (
-    ModelNotFoundError, ValidationError, InvalidSeriesIdError,
-    ModelNotFittedError, AnomalyDetectionError
+    get_anomaly_service, get_metrics_exporter, get_visualization_service,
+    get_prediction_batcher, get_training_job_store
 )
+from src.exceptions import ValidationError
 
 router = APIRouter()
 
+# Plot formats and their media types, built once rather than per request
+_MEDIA_TYPES = MappingProxyType({
+    'png': 'image/png',
+    'jpg': 'image/jpeg',
+    'svg': 'image/svg+xml'
+})
+_ALLOWED_FORMATS = frozenset(_MEDIA_TYPES)
+
+# series_id path parameters are checked by pydantic-core before the handler runs
+SeriesIdPath = Annotated[str, Path(
+    min_length=1, max_length=100, pattern=SERIES_ID_PATTERN,
+    description="Identifier for the time series"
+)]
+_INVALID_SERIES_ID_RESPONSE = {
+    400: {
+        "description": "Invalid series_id",
+        "content": {"application/json": {"example": {
+            "detail": "Invalid series_id 'sensor@1': series_id can only contain alphanumeric "
+                      "characters, underscores, hyphens, and dots"
+        }}}
+    }
+}
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Checks an If-None-Match header (possibly a list or '*') against an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    return any(
+        candidate.strip().removeprefix('W/') == etag
+        for candidate in if_none_match.split(',')
+    )
 
-@router.post("/fit/{series_id}", response_model=TrainResponse, tags=["Training"])
+
+@router.post(
+    "/fit/{series_id}", response_model=TrainResponse, tags=["Training"],
+    responses={
+        202: {"model": TrainJobResponse, "description": "Training job accepted"},
+        **_INVALID_SERIES_ID_RESPONSE
+    }
+)
 async def train_model(
-    series_id: str,
+    series_id: SeriesIdPath,
     train_data: Union[TrainData, TrainDataExternal],
-    anomaly_service: AnomalyDetectionService = Depends(get_anomaly_service)
-) -> TrainResponse:
+    background_tasks: BackgroundTasks,
+    background: bool = Query(
+        False, description="Train in the background and return 202 with a job to poll"
+    ),
+    anomaly_service: AnomalyDetectionService = Depends(get_anomaly_service),
+    job_store: TrainingJobStore = Depends(get_training_job_store)
+) -> Union[TrainResponse, ORJSONResponse]:
     """
     Train an anomaly detection model for a specific time series.
 
     Args:
         series_id: Identifier for the time series
         train_data: Training data with timestamps, values, and optional metadata
+        background_tasks: Request-scoped background task queue
+        background: Whether to train after responding, returning a job to poll
         anomaly_service: Injected anomaly detection service
+        job_store: Injected registry of background training jobs
     """
-    try:
-        # Validate series_id format
-        validate_series_id(series_id)
+    logger.info(
+        "Training request for series_id='%s' with %d data points",
+        series_id, len(train_data.values)
+    )
+    if not hasattr(train_data, 'metadata'):
+        metadata = None
+    else:
+        metadata = train_data.metadata
 
-        logger.info(
-            "Training request for series_id='%s' with %d data points",
-            series_id, len(train_data.values)
+    if background:
+        job = job_store.create(series_id)
+        # Sync background tasks run on the threadpool once the response is sent
+        background_tasks.add_task(
+            job_store.run, job.job_id, anomaly_service.train_model,
+            series_id, train_data, metadata
         )
-        if not hasattr(train_data, 'metadata'):
-            metadata = None
-        else:
-            metadata = train_data.metadata
+        logger.info("Queued training job '%s' for series_id='%s'", job.job_id, series_id)
+        return ORJSONResponse(job.model_dump(), status_code=202)
 
-        result = anomaly_service.train_model(series_id, train_data, metadata)
+    # Fit/score do blocking model I/O and numpy work; keep them off the event loop
+    result = await run_in_threadpool(
+        anomaly_service.train_model, series_id, train_data, metadata
+    )
 
-        logger.info(
-            "Training completed for series_id='%s', version='%s'",
-            series_id, result.version
-        )
+    logger.info(
+        "Training completed for series_id='%s', version='%s'",
+        series_id, result.version
+    )
 
-        return result
-
-    except (ValidationError, InvalidSeriesIdError) as e:
-        logger.warning("Validation error for series_id='%s': %s", series_id, e.message)
-        raise HTTPException(status_code=e.status_code, detail=e.message) from e
-    except AnomalyDetectionError as e:
-        logger.error("Error training model for series_id='%s': %s", series_id, e.message)
-        raise HTTPException(status_code=e.status_code, detail=e.message) from e
-    except Exception as e:
-        logger.error(
-            "Unexpected error training model for series_id='%s': %s",
-            series_id, str(e), exc_info=True
-        )
-        raise HTTPException(
-            status_code=500, detail="Internal server error during training"
-        ) from e
+    return result
+
+
+@router.get("/jobs/{job_id}", response_model=TrainJobResponse, tags=["Training"])
+async def get_training_job(
+    job_id: str,
+    job_store: TrainingJobStore = Depends(get_training_job_store)
+) -> TrainJobResponse:
+    """Get the status, and result once done, of a background training job."""
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Training job '{job_id}' not found")
+    return job
 
 
-@router.post("/predict/{series_id}", response_model=PredictResponse, tags=["Prediction"])
+@router.post(
+    "/fit_batch", response_model=TrainBatchResponse, tags=["Training"],
+    responses={501: {"description": "Batch training unsupported by the training backend"}}
+)
+async def train_models(
+    batch_data: TrainBatchData,
+    anomaly_service: AnomalyDetectionService = Depends(get_anomaly_service)
+) -> TrainBatchResponse:
+    """Train anomaly detection models for many time series in a single request."""
+    for series_id in batch_data.series:
+        validate_series_id(series_id)
+
+    logger.info("Batch training request with %d series", len(batch_data.series))
+
+    return await run_in_threadpool(anomaly_service.train_models, batch_data.series)
+
+
+@router.post(
+    "/predict/{series_id}", response_model=PredictResponse, tags=["Prediction"],
+    responses=_INVALID_SERIES_ID_RESPONSE
+)
 async def predict_anomaly(
-    series_id: str,
+    series_id: SeriesIdPath,
     predict_data: PredictData,
     version: Optional[str] = Query(None),
-    anomaly_service: AnomalyDetectionService = Depends(get_anomaly_service)
-) -> PredictResponse:
+    anomaly_service: AnomalyDetectionService = Depends(get_anomaly_service),
+    prediction_batcher: Optional[PredictionBatcher] = Depends(get_prediction_batcher)
+) -> ORJSONResponse:
     """Predict if a data point is anomalous for a specific time series."""
-    try:
-        # Validate series_id format
-        validate_series_id(series_id)
-
-        logger.debug(
-            "Prediction request for series_id='%s', version='%s', value=%s",
-            series_id, version, predict_data.value
+    data_point = DataPoint.model_construct(
+        timestamp=predict_data.timestamp, value=predict_data.value
+    )
+    if prediction_batcher is not None:
+        result = await prediction_batcher.submit(series_id, version, data_point.value)
+    else:
+        result = await run_in_threadpool(
+            anomaly_service.predict_anomaly, series_id, data_point, version
         )
 
-        result = anomaly_service.predict_anomaly(
-            series_id, predict_data.to_data_point(), version
-        )
+    logger.debug(
+        "Prediction for series_id='%s', value=%s: anomaly=%s, version='%s'",
+        series_id, predict_data.value, result.anomaly, result.model_version
+    )
 
-        logger.debug(
-            "Prediction result for series_id='%s': anomaly=%s, version='%s'",
-            series_id, result.anomaly, result.model_version
-        )
+    # Hand orjson the plain dict so FastAPI skips re-validating the response model
+    return ORJSONResponse(result.model_dump())
 
-        return result
-
-    except ModelNotFoundError as e:
-        logger.warning("Model not found: %s", e.message)
-        raise HTTPException(status_code=404, detail=e.message) from e
-    except (ValidationError, InvalidSeriesIdError, ModelNotFittedError) as e:
-        logger.warning("Validation error: %s", e.message)
-        raise HTTPException(status_code=e.status_code, detail=e.message) from e
-    except AnomalyDetectionError as e:
-        logger.error("Error making prediction: %s", e.message)
-        raise HTTPException(status_code=e.status_code, detail=e.message) from e
-    except Exception as e:
-        logger.error(
-            "Unexpected error making prediction for series_id='%s': %s",
-            series_id, str(e), exc_info=True
-        )
-        raise HTTPException(
-            status_code=500, detail="Internal server error during prediction"
-        ) from e
+
+@router.post("/predict_batch", response_model=PredictBatchResponse, tags=["Prediction"])
+async def predict_anomaly_batch(
+    batch_data: PredictBatchData,
+    anomaly_service: AnomalyDetectionService = Depends(get_anomaly_service)
+) -> ORJSONResponse:
+    """Predict anomalies for many data points, across series, in a single request."""
+    for item in batch_data.items:
+        validate_series_id(item.series_id)
+
+    logger.debug("Batch prediction request with %d items", len(batch_data.items))
+
+    result = await run_in_threadpool(anomaly_service.predict_anomaly_batch, batch_data.items)
+    return ORJSONResponse(result.model_dump())
+
+
+@router.post(
+    "/predict_batch/{series_id}", response_model=PredictSeriesBatchResponse, tags=["Prediction"],
+    responses=_INVALID_SERIES_ID_RESPONSE
+)
+async def predict_series_batch(
+    series_id: SeriesIdPath,
+    batch_data: PredictSeriesBatchData,
+    version: Optional[str] = Query(None),
+    anomaly_service: AnomalyDetectionService = Depends(get_anomaly_service)
+) -> ORJSONResponse:
+    """Predict anomalies for an array of values of a single time series."""
+    logger.debug(
+        "Batch prediction request for series_id='%s', version='%s' with %d values",
+        series_id, version, len(batch_data.values)
+    )
+
+    result = await run_in_threadpool(
+        anomaly_service.predict_series_batch, series_id, batch_data.values, version
+    )
+    return ORJSONResponse(result.model_dump())
 
 
 @router.get("/healthcheck", response_model=HealthCheckResponse, tags=["Health Check"])
@@ -126,34 +222,29 @@ async def healthcheck(
     metrics_exporter: BaseMetricsExporter = Depends(get_metrics_exporter)
 ) -> HealthCheckResponse:
     """Get system health and performance metrics."""
-    try:
-        # Get the number of trained series
-        series_trained = anomaly_service.get_trained_series_count()
+    # Get the number of trained series
+    series_trained = anomaly_service.get_trained_series_count()
 
-        # Get latency metrics
-        inference_metrics = metrics_exporter.get_inference_metrics()
-        training_metrics = metrics_exporter.get_training_metrics()
+    # Get latency metrics; exporters reuse their summaries while nothing new is recorded
+    inference_metrics = metrics_exporter.get_inference_metrics()
+    training_metrics = metrics_exporter.get_training_metrics()
 
-        logger.debug(
-            "Health check: %d series trained, avg inference latency: %sms",
-            series_trained, inference_metrics.avg
-        )
+    logger.debug(
+        "Health check: %d series trained, avg inference latency: %sms",
+        series_trained, inference_metrics.avg
+    )
 
-        return HealthCheckResponse(
-            series_trained=series_trained,
-            inference_latency_ms=inference_metrics,
-            training_latency_ms=training_metrics
-        )
-    except Exception as e:
-        logger.error("Error in healthcheck: %s", str(e), exc_info=True)
-        raise HTTPException(
-            status_code=500, detail="Internal server error during health check"
-        ) from e
+    return HealthCheckResponse.model_construct(
+        series_trained=series_trained,
+        inference_latency_ms=inference_metrics,
+        training_latency_ms=training_metrics
+    )
 
 
-@router.get("/plot/{series_id}", tags=["Visualization"])
+@router.get("/plot/{series_id}", tags=["Visualization"], responses=_INVALID_SERIES_ID_RESPONSE)
 async def plot_time_series(
-    series_id: str,
+    request: Request,
+    series_id: SeriesIdPath,
     version: Optional[str] = Query(None, description="Model version to use for plotting"),
     img_format: str = Query("png", description="Image format (png, jpg, svg)", alias="format"),
     visualization_service: VisualizationService = Depends(get_visualization_service)
@@ -167,53 +258,40 @@ async def plot_time_series(
     - Normal range shaded area
     - Model statistics
     """
-    try:
-        # Validate series_id format
-        validate_series_id(series_id)
-
-        # Validate format
-        if img_format not in ['png', 'jpg', 'svg']:
-            raise ValidationError(
-                f"Unsupported format '{img_format}'. Use 'png', 'jpg', or 'svg'",
-                field="format"
-            )
-
-        logger.info(
-            "Generating plot for series_id='%s', version='%s', format='%s'",
-            series_id, version, img_format
+    # Validate format
+    if img_format not in _ALLOWED_FORMATS:
+        raise ValidationError(
+            f"Unsupported format '{img_format}'. Use 'png', 'jpg', or 'svg'",
+            field="format"
         )
 
-        # Generate plot
-        image_bytes = visualization_service.plot_time_series(series_id, version, img_format)
+    logger.info(
+        "Generating plot for series_id='%s', version='%s', format='%s'",
+        series_id, version, img_format
+    )
 
-        # Determine media type
-        media_type_map = {
-            'png': 'image/png',
-            'jpg': 'image/jpeg',
-            'svg': 'image/svg+xml'
-        }
+    # A (series_id, version, format) plot never changes, so it makes a strong ETag
+    used_version = await run_in_threadpool(
+        visualization_service.resolve_version, series_id, version
+    )
+    etag = f'"{series_id}:{used_version}:{img_format}"'
+    # "latest" moves on retrain, so browsers must revalidate it; pinned versions can be reused
+    cache_control = 'private, max-age=30' if version is not None else 'no-cache'
+    if _etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(status_code=304, headers={'ETag': etag, 'Cache-Control': cache_control})
 
-        filename = f'timeseries_{series_id}_{version or "latest"}.{img_format}'
-        return Response(
-            content=image_bytes,
-            media_type=media_type_map[img_format],
-            headers={'Content-Disposition': f'inline; filename="{filename}"'}
-        )
+    # Generate plot in the render pool so matplotlib never blocks the event loop
+    image_bytes = await visualization_service.render_time_series(
+        series_id, used_version, img_format
+    )
 
-    except ModelNotFoundError as e:
-        logger.warning("Model not found for plot: %s", e.message)
-        raise HTTPException(status_code=404, detail=e.message) from e
-    except (ValidationError, InvalidSeriesIdError) as e:
-        logger.warning("Validation error in plot: %s", e.message)
-        raise HTTPException(status_code=e.status_code, detail=e.message) from e
-    except AnomalyDetectionError as e:
-        logger.error("Error generating plot: %s", e.message)
-        raise HTTPException(status_code=e.status_code, detail=e.message) from e
-    except Exception as e:
-        logger.error(
-            "Unexpected error generating plot for series_id='%s': %s",
-            series_id, str(e), exc_info=True
-        )
-        raise HTTPException(
-            status_code=500, detail="Internal server error during plot generation"
-        ) from e
+    filename = f'timeseries_{series_id}_{version or "latest"}.{img_format}'
+    return Response(
+        content=image_bytes,
+        media_type=_MEDIA_TYPES[img_format],
+        headers={
+            'Content-Disposition': f'inline; filename="{filename}"',
+            'ETag': etag,
+            'Cache-Control': cache_control
+        }
+    )
@@ -1,6 +1,7 @@
 """
 Centralized configuration of system backends.
 """
+from functools import lru_cache
 from pydantic import BaseModel
 from pydantic_settings import BaseSettings
 
@@ -19,6 +20,7 @@ class SklearnModelConfig(BaseModel):
 class FilesystemStorageConfig(BaseModel):
     """Config for filesystem storage."""
     storage_path: str = "./model_storage"
+    fsync: bool = False
 
 
 class S3StorageConfig(BaseModel):
@@ -44,6 +46,34 @@ class ExternalTrainingConfig(BaseModel):
     timeout: int = 30
 
 
+class PredictionCacheConfig(BaseModel):
+    """
+    Config for the in-process prediction cache (ttl_seconds <= 0 disables it).
+
+    Off by default: entries are only invalidated by retrains in this process, so with
+    several workers a "latest" prediction can lag a retrain by up to ttl_seconds.
+    """
+    ttl_seconds: float = 0.0
+    max_entries: int = 10000
+
+
+class ModelCacheConfig(BaseModel):
+    """Config for the in-process cache of loaded models (max_entries <= 0 disables it)."""
+    max_entries: int = 1024
+
+
+class PredictionBatchingConfig(BaseModel):
+    """Config for micro-batching concurrent /predict calls."""
+    enabled: bool = False
+    max_batch_size: int = 64
+    max_latency_ms: float = 10.0
+
+
+class PlotRenderingConfig(BaseModel):
+    """Config for rendering /plot images in a process pool (<= 0 renders in-thread, no pool)."""
+    process_pool_workers: int = 0
+
+
 class AppConfig(BaseSettings):
     """Application settings."""
 
@@ -68,6 +98,18 @@ class AppConfig(BaseSettings):
     # Training configs
     external_training: ExternalTrainingConfig = ExternalTrainingConfig()
 
+    # Prediction cache config
+    prediction_cache: PredictionCacheConfig = PredictionCacheConfig()
+
+    # Loaded model cache config
+    model_cache: ModelCacheConfig = ModelCacheConfig()
+
+    # Prediction batching config
+    prediction_batching: PredictionBatchingConfig = PredictionBatchingConfig()
+
+    # Plot rendering config
+    plot_rendering: PlotRenderingConfig = PlotRenderingConfig()
+
     class Config:  # pylint: disable=too-few-public-methods
         """Pydantic configuration."""
         env_prefix = "APP_"
@@ -75,5 +117,7 @@ class AppConfig(BaseSettings):
         env_nested_delimiter = "__"
 
 
-# Global instance
-config = AppConfig()
+@lru_cache(maxsize=1)
+def get_config() -> AppConfig:
+    """Parses the environment into AppConfig once; get_config.cache_clear() re-reads it."""
+    return AppConfig()
@@ -4,13 +4,17 @@ Main application entry point.
 """
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import ValidationError as PydanticValidationError
 from src.api.routes import router
+from src.api.dependencies import init_dependencies, close_dependencies
 from src.api.exception_handlers import (
     anomaly_detection_error_handler,
     validation_error_handler,
     pydantic_validation_error_handler,
+    request_validation_error_handler,
     general_exception_handler
 )
 from src.exceptions import AnomalyDetectionError, ValidationError
@@ -27,9 +31,11 @@ async def lifespan(app: FastAPI):  # noqa: ARG001 pylint: disable=unused-argumen
     """
     # Startup
     logger.info("Starting Time Series Anomaly Detection API")
+    init_dependencies()
     yield
     # Shutdown
     logger.info("Shutting down Time Series Anomaly Detection API")
+    close_dependencies()
 
 
 # Initialize FastAPI app
@@ -37,7 +43,8 @@ app = FastAPI(
     title="Time Series Anomaly Detection API",
     description="API for training and inference of anomaly detection models on time series data",
     version="0.1.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -53,6 +60,7 @@ app.add_middleware(
 app.add_exception_handler(AnomalyDetectionError, anomaly_detection_error_handler)
 app.add_exception_handler(ValidationError, validation_error_handler)
 app.add_exception_handler(PydanticValidationError, pydantic_validation_error_handler)
+app.add_exception_handler(RequestValidationError, request_validation_error_handler)
 app.add_exception_handler(Exception, general_exception_handler)
 
 
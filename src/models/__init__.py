@@ -4,10 +4,19 @@ Models package for anomaly detection.
 from .schemas import (
     DataPoint,
     TimeSeries,
+    TimeSeriesArray,
     TrainData,
     TrainResponse,
+    TrainJobResponse,
+    TrainBatchData,
+    TrainBatchResponse,
     PredictData,
     PredictResponse,
+    PredictBatchItem,
+    PredictBatchData,
+    PredictBatchResponse,
+    PredictSeriesBatchData,
+    PredictSeriesBatchResponse,
     HealthCheckResponse,
     Metrics
 )
@@ -15,10 +24,19 @@ from .schemas import (
 __all__ = [
     "DataPoint",
     "TimeSeries",
+    "TimeSeriesArray",
     "TrainData",
     "TrainResponse",
+    "TrainJobResponse",
+    "TrainBatchData",
+    "TrainBatchResponse",
     "PredictData",
     "PredictResponse",
+    "PredictBatchItem",
+    "PredictBatchData",
+    "PredictBatchResponse",
+    "PredictSeriesBatchData",
+    "PredictSeriesBatchResponse",
     "HealthCheckResponse",
     "Metrics"
 ]
@@ -1,14 +1,42 @@
 """
 Pydantic models for Time Series data structures and API requests/responses.
 """
-from typing import Sequence, List
+from functools import lru_cache
+from typing import Dict, Iterator, Literal, Sequence, List, Optional
 import re
 import math
 import numpy as np
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
 from src.exceptions import ValidationError, InvalidSeriesIdError
 
 
+# Single-pass allowlist: 1-100 allowed characters and no ".." sequence anywhere
+_SERIES_ID_RE = re.compile(r'^(?!.*\.\.)[A-Za-z0-9_.\-]{1,100}\Z')
+_SERIES_ID_CHARS_RE = re.compile(r'[A-Za-z0-9_.\-]+')
+
+# Same rule without look-around, for pydantic-core's Rust regex engine (length checked apart)
+SERIES_ID_PATTERN = r'^\.?(?:[A-Za-z0-9_\-]+\.?)*$'
+
+
+@lru_cache(maxsize=4096)
+def _series_id_error(series_id: str) -> Optional[str]:
+    """Return why series_id is invalid, or None; memoized for repeat IDs."""
+    if _SERIES_ID_RE.match(series_id):
+        return None
+
+    # Slow path, only for rejected IDs: work out which rule was broken
+    if not series_id:
+        return "series_id cannot be empty"
+
+    if '..' in series_id or '/' in series_id or '\\' in series_id:
+        return "series_id cannot contain path traversal characters"
+
+    if len(series_id) > 100 and _SERIES_ID_CHARS_RE.fullmatch(series_id):
+        return f"series_id too long (max 100 characters, got {len(series_id)})"
+
+    return "series_id can only contain alphanumeric characters, underscores, hyphens, and dots"
+
+
 def validate_series_id(series_id: str) -> None:
     """
     Validate series_id format to prevent path injection attacks.
@@ -19,27 +47,66 @@ def validate_series_id(series_id: str) -> None:
     Raises:
         InvalidSeriesIdError: If series_id contains invalid characters
     """
-    if not series_id:
-        raise InvalidSeriesIdError(series_id, "series_id cannot be empty")
+    reason = _series_id_error(series_id)
+    if reason is not None:
+        raise InvalidSeriesIdError(series_id, reason)
 
-    if '..' in series_id or '/' in series_id or '\\' in series_id:
-        raise InvalidSeriesIdError(
-            series_id,
-            "series_id cannot contain path traversal characters"
+
+def validate_training_values(v: Sequence[float], field: str) -> np.ndarray:
+    """Validate training values in vectorized passes, returning them as a float64 array."""
+    if len(v) == 0:
+        raise ValidationError("Values list cannot be empty", field=field)
+
+    if len(v) < 3:
+        raise ValidationError(
+            f"Minimum 3 data points required for training, got {len(v)}",
+            field=field
+        )
+
+    arr = np.asarray(v, dtype=np.float64)
+
+    # Check for NaN or Inf values, locating the offender only on failure
+    finite = np.isfinite(arr)
+    if not finite.all():
+        i = int(np.argmin(finite))
+        kind = "NaN" if math.isnan(arr[i]) else "Infinite"
+        raise ValidationError(
+            f"{kind} value detected at index {i}",
+            field=field
         )
 
-    if not re.match(r'^[a-zA-Z0-9_\-\.]+$', series_id):
-        raise InvalidSeriesIdError(
-            series_id,
-            "series_id can only contain alphanumeric characters, underscores, hyphens, and dots"
+    # Check for constant values (std = 0)
+    if arr.std() == 0:
+        raise ValidationError(
+            "Cannot train on constant values (standard deviation is 0)",
+            field=field
         )
 
-    if len(series_id) > 100:
-        raise InvalidSeriesIdError(
-            series_id,
-            f"series_id too long (max 100 characters, got {len(series_id)})"
+    return arr
+
+
+def _validate_timestamps(v: Sequence[int]) -> np.ndarray:
+    """Validate a timestamp list, returning it as an int64 array."""
+    if len(v) == 0:
+        raise ValidationError("Timestamps list cannot be empty", field="timestamps")
+
+    if len(v) < 3:
+        raise ValidationError(
+            f"Minimum 3 data points required for training, got {len(v)}",
+            field="timestamps"
+        )
+
+    ts = np.asarray(v, dtype=np.int64)
+
+    # Check for timestamp ordering
+    if (np.diff(ts) < 0).any():
+        raise ValidationError(
+            "Timestamps must be in ascending order",
+            field="timestamps"
         )
 
+    return ts
+
 
 class DataPoint(BaseModel):
     """Represents a single data point in a time series."""
@@ -61,6 +128,30 @@ class TimeSeries(BaseModel):
         )
     )
 
+    @property
+    def values_array(self) -> np.ndarray:
+        """Values of every data point as a float64 array."""
+        return np.fromiter((d.value for d in self.data), dtype=np.float64, count=len(self.data))
+
+
+class TimeSeriesArray(BaseModel):
+    """Time series stored as parallel timestamp and value arrays."""
+    model_config = {"arbitrary_types_allowed": True}
+
+    timestamps: np.ndarray = Field(..., description="Unix timestamps as an int64 array")
+    values: np.ndarray = Field(..., description="Values as a float64 array")
+
+    @property
+    def values_array(self) -> np.ndarray:
+        """Values as a float64 array."""
+        return self.values
+
+    def iter_points(self) -> Iterator[DataPoint]:
+        """Lazily yields DataPoint views for callers that need per-point objects."""
+        # The arrays come from validated TrainData, so skip per-point validation
+        for ts, val in zip(self.timestamps.tolist(), self.values.tolist()):
+            yield DataPoint.model_construct(timestamp=ts, value=val)
+
 
 class TrainData(BaseModel):
     """Request model for training endpoint."""
@@ -71,84 +162,35 @@ class TrainData(BaseModel):
         ..., description="Values corresponding to each timestamp"
     )
 
+    _timestamps_np: np.ndarray = PrivateAttr()
+    _values_np: np.ndarray = PrivateAttr()
+
     def model_post_init(self, __context):  # noqa: ARG002
-        """Validate that timestamps and values have the same length."""
+        """Validate both arrays in vectorized passes and keep them for downstream use."""
+        self._timestamps_np = _validate_timestamps(self.timestamps)
+        self._values_np = validate_training_values(self.values, field="values")
+
         if len(self.timestamps) != len(self.values):
             raise ValidationError(
                 f"Timestamps ({len(self.timestamps)}) and values "
                 f"({len(self.values)}) must have the same length"
             )
 
-    @field_validator('timestamps')
-    @classmethod
-    def validate_timestamps(cls, v):
-        """Validate timestamp array."""
-        if len(v) == 0:
-            raise ValidationError("Timestamps list cannot be empty", field="timestamps")
-
-        if len(v) < 3:
-            raise ValidationError(
-                f"Minimum 3 data points required for training, got {len(v)}",
-                field="timestamps"
-            )
-
-        # Check for timestamp ordering
-        if not all(v[i] <= v[i+1] for i in range(len(v)-1)):
-            raise ValidationError(
-                "Timestamps must be in ascending order",
-                field="timestamps"
-            )
-
-        return v
-
-    @field_validator('values')
-    @classmethod
-    def validate_values(cls, v):
-        """Validate values array."""
-        if len(v) == 0:
-            raise ValidationError("Values list cannot be empty", field="values")
-
-        if len(v) < 3:
-            raise ValidationError(
-                f"Minimum 3 data points required for training, got {len(v)}",
-                field="values"
-            )
-
-        # Check for NaN or Inf values
-        for i, val in enumerate(v):
-            if math.isnan(val):
-                raise ValidationError(
-                    f"NaN value detected at index {i}",
-                    field="values"
-                )
-            if math.isinf(val):
-                raise ValidationError(
-                    f"Infinite value detected at index {i}",
-                    field="values"
-                )
-
-        # Check for constant values (std = 0)
-        if len(v) >= 3 and np.std(v) == 0:
-            raise ValidationError(
-                "Cannot train on constant values (standard deviation is 0)",
-                field="values"
-            )
-
-        return v
+    @property
+    def timestamps_array(self) -> np.ndarray:
+        """Validated timestamps as an int64 array."""
+        return self._timestamps_np
 
-    def to_time_series(self) -> TimeSeries:
-        """Convert TrainData to TimeSeries object."""
-        if len(self.timestamps) != len(self.values):
-            raise ValidationError(
-                f"Timestamps ({len(self.timestamps)}) and values "
-                f"({len(self.values)}) must have the same length"
-            )
+    @property
+    def values_array(self) -> np.ndarray:
+        """Validated values as a float64 array."""
+        return self._values_np
 
-        data_points = [
-            DataPoint(timestamp=ts, value=val)
-            for ts, val in zip(self.timestamps, self.values)
-        ]
-        return TimeSeries(data=data_points)
+    def to_time_series(self) -> TimeSeriesArray:
+        """Convert TrainData to a TimeSeriesArray sharing the validated arrays."""
+        return TimeSeriesArray.model_construct(
+            timestamps=self._timestamps_np, values=self._values_np
+        )
 
 
 class TrainDataExternal(TrainData):
@@ -165,23 +207,44 @@ class TrainResponse(BaseModel):
     points_used: int = Field(..., description="Number of data points used for training")
 
 
+class TrainJobResponse(BaseModel):
+    """Status of a background training job."""
+    job_id: str = Field(..., description="Identifier to poll the job with")
+    series_id: str = Field(..., description="Identifier for the series being trained")
+    status: Literal["pending", "done", "failed"] = Field(..., description="Job state")
+    result: Optional[TrainResponse] = Field(None, description="Training result once done")
+    detail: Optional[str] = Field(None, description="Error message if the job failed")
+
+
+class TrainBatchData(BaseModel):
+    """Request model for the batched training endpoint."""
+    series: Dict[str, TrainData] = Field(
+        ..., description="Training timestamps and values keyed by series identifier"
+    )
+
+    @field_validator('series')
+    @classmethod
+    def validate_series(cls, v):
+        """Reject an empty batch; each TrainData validates its own arrays."""
+        if len(v) == 0:
+            raise ValidationError("Series map cannot be empty", field="series")
+        return v
+
+
+class TrainBatchResponse(BaseModel):
+    """Response model for the batched training endpoint."""
+    models: List[TrainResponse] = Field(
+        ..., description="Training results, in the order the series were submitted"
+    )
+
+
 # Prediction API Models
 class PredictData(BaseModel):
     """Request model for prediction endpoint."""
-    timestamp: str = Field(..., description="Timestamp of the data point")
+    # pydantic-core coerces numeric strings such as "1609459200" to int
+    timestamp: int = Field(..., description="Unix timestamp of the data point")
     value: float = Field(..., description="Value to check for anomaly")
 
-    def to_data_point(self) -> DataPoint:
-        """Convert PredictData to DataPoint object."""
-        # Handle both string and int timestamps
-        try:
-            ts = int(self.timestamp)
-        except ValueError as exc:
-            raise ValueError(
-                "Timestamp must be a valid integer or numeric string"
-            ) from exc
-        return DataPoint(timestamp=ts, value=self.value)
-
 
 class PredictResponse(BaseModel):
     """Response model for prediction endpoint."""
@@ -191,6 +254,52 @@ class PredictResponse(BaseModel):
     model_version: str = Field(..., description="Version of the model used for prediction")
 
 
+class PredictBatchItem(BaseModel):
+    """Single entry of a batched prediction request."""
+    series_id: str = Field(..., description="Identifier for the time series")
+    timestamp: int = Field(..., description="Unix timestamp of the data point")
+    value: float = Field(..., description="Value to check for anomaly")
+
+    def to_data_point(self) -> DataPoint:
+        """Convert PredictBatchItem to DataPoint object."""
+        # Fields were validated when the batch item was parsed
+        return DataPoint.model_construct(timestamp=self.timestamp, value=self.value)
+
+
+class PredictBatchData(BaseModel):
+    """Request model for batched prediction endpoint."""
+    items: List[PredictBatchItem] = Field(
+        ..., description="Data points to score, each tagged with its series_id"
+    )
+
+
+class PredictSeriesBatchData(BaseModel):
+    """Request model for batched prediction on a single series."""
+    values: List[float] = Field(..., description="Values to check for anomaly")
+
+
+class PredictSeriesBatchResponse(BaseModel):
+    """Response model for batched prediction on a single series."""
+    model_config = {"protected_namespaces": ()}
+
+    anomalies: List[bool] = Field(
+        ..., description="Anomaly flag for each item, in request order"
+    )
+    model_version: str = Field(..., description="Version of the model used for prediction")
+
+
+class PredictBatchResponse(BaseModel):
+    """Response model for batched prediction endpoint."""
+    model_config = {"protected_namespaces": ()}
+
+    anomalies: List[bool] = Field(
+        ..., description="Anomaly flag for each item, in request order"
+    )
+    model_versions: List[str] = Field(
+        ..., description="Version of the model used for each item, in request order"
+    )
+
+
 # Health Check API Models
 class Metrics(BaseModel):
     """Metrics for performance monitoring."""
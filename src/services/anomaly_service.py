@@ -2,10 +2,16 @@
 Service layer for anomaly detection business logic.
 """
 import time
-from typing import Optional
-from src.models.schemas import TrainData, DataPoint, TrainResponse, PredictResponse
+from typing import Dict, Optional, Sequence
+import numpy as np
+from src.anomaly_models.base_model import BaseAnomalyModel
+from src.models.schemas import (
+    TrainData, DataPoint, TrainResponse, TrainBatchResponse, PredictResponse,
+    PredictBatchItem, PredictBatchResponse, PredictSeriesBatchResponse
+)
 from src.storage.base_storage import BaseModelStorage
 from src.utils.base_metrics import BaseMetricsExporter
+from src.utils.ttl_cache import TTLCache
 from src.utils.logger import logger
 from src.exceptions import ModelNotFoundError
 from src.services.base_training_service import BaseTrainingService
@@ -17,16 +23,40 @@ class AnomalyDetectionService:
     def __init__(self,
                  model_storage: BaseModelStorage,
                  metrics_exporter: BaseMetricsExporter,
-                 training_service: BaseTrainingService):
+                 training_service: BaseTrainingService,
+                 prediction_cache: Optional[TTLCache] = None,
+                 model_cache: Optional[TTLCache] = None):
         self.model_storage = model_storage
         self.metrics_exporter = metrics_exporter
         self.training_service = training_service
+        self.prediction_cache = prediction_cache
+        # Deserialized models by (series_id, version); a stored version never changes
+        self.model_cache = model_cache
+        # Bumped on every retrain so cached predictions for the series stop matching
+        self._series_generation: dict[str, int] = {}
+        # Listing every series is a directory walk or S3 listing; reuse the count briefly
+        self._series_count_cache = TTLCache(max_entries=1, ttl_seconds=2.0)
 
     def train_model(
             self, series_id: str, train_data: TrainData,
             metadata: dict = None) -> TrainResponse:
         """Delegates training to configured training service."""
-        return self.training_service.train(series_id, train_data, metadata)
+        result = self.training_service.train(series_id, train_data, metadata)
+        self._invalidate_predictions(series_id)
+        self._series_count_cache.clear()
+        return result
+
+    def train_models(self, series_map: Dict[str, TrainData]) -> TrainBatchResponse:
+        """Trains many series in one call through the training service's batch path."""
+        models = self.training_service.train_batch(series_map)
+        for series_id in series_map:
+            self._invalidate_predictions(series_id)
+        self._series_count_cache.clear()
+        return TrainBatchResponse.model_construct(models=models)
+
+    def _invalidate_predictions(self, series_id: str) -> None:
+        """Makes cached predictions for series_id unreachable after a retrain."""
+        self._series_generation[series_id] = self._series_generation.get(series_id, 0) + 1
 
     def predict_anomaly(
         self,
@@ -34,27 +64,135 @@ class AnomalyDetectionService:
         data_point: DataPoint,
         version: Optional[str] = None
     ) -> PredictResponse:
-        """Makes prediction using abstract storage."""
-        start_time = time.time()
+        """Makes prediction using abstract storage, served from cache on repeats."""
+        start_ns = time.perf_counter_ns()
+        # Unwrap once; models score the bare float
+        value = data_point.value
 
-        try:
-            model, used_version = self.model_storage.load_model(series_id, version)
-        except FileNotFoundError as exc:
-            logger.warning(
-                "Model not found for series_id='%s', version='%s'", series_id, version
+        cache_key = None
+        response = None
+        if self.prediction_cache is not None:
+            cache_key = (
+                series_id, self._series_generation.get(series_id, 0),
+                version, data_point.timestamp, value
             )
-            raise ModelNotFoundError(series_id, version) from exc
+            response = self.prediction_cache.get(cache_key)
+
+        if response is None:
+            model, used_version = self._load_model(series_id, version)
+            is_anomaly = bool(model.predict(value))
+
+            # Fields are produced here from a loaded model, so skip revalidating them
+            response = PredictResponse.model_construct(
+                anomaly=is_anomaly,
+                model_version=used_version
+            )
+            if cache_key is not None:
+                self.prediction_cache.set(cache_key, response)
 
-        is_anomaly = model.predict(data_point)
+            # Only scored points count as inference; cache hits would drag the latency down
+            self.metrics_exporter.record_inference_latency_ns(time.perf_counter_ns() - start_ns)
 
-        latency_ms = (time.time() - start_time) * 1000
-        self.metrics_exporter.record_inference_latency(latency_ms)
+        return response
 
-        return PredictResponse(
-            anomaly=is_anomaly,
+    def predict_series_batch(
+        self,
+        series_id: str,
+        values: Sequence[float],
+        version: Optional[str] = None
+    ) -> PredictSeriesBatchResponse:
+        """Scores many values of one series with a single model load."""
+        start_ns = time.perf_counter_ns()
+
+        model, used_version = self._load_model(series_id, version)
+        anomalies = model.predict_batch(np.asarray(values, dtype=np.float64))
+
+        self.metrics_exporter.record_inference_latency_ns(time.perf_counter_ns() - start_ns)
+        self.metrics_exporter.record_inference_batch_size(len(values))
+
+        return PredictSeriesBatchResponse.model_construct(
+            anomalies=anomalies.tolist(),
             model_version=used_version
         )
 
+    def predict_anomaly_batch(
+        self,
+        items: Sequence[PredictBatchItem]
+    ) -> PredictBatchResponse:
+        """Scores many points across series with as few vectorized compares as possible."""
+        start_ns = time.perf_counter_ns()
+
+        # Map each item to a dense series index, in first-seen order
+        series_index: dict[str, int] = {}
+        inverse = np.fromiter(
+            (series_index.setdefault(item.series_id, len(series_index)) for item in items),
+            dtype=np.intp, count=len(items)
+        )
+        values = np.fromiter((item.value for item in items), dtype=np.float64, count=len(items))
+
+        loaded = [self._load_model(series_id) for series_id in series_index]
+        bounds = [model.upper_bound for model, _ in loaded]
+
+        if None not in bounds:
+            # Every model is a single upper threshold: gather bounds per item, one compare
+            anomalies = values > np.asarray(bounds, dtype=np.float64)[inverse]
+        else:
+            anomalies = np.zeros(len(items), dtype=bool)
+            for position, (model, _) in enumerate(loaded):
+                index = np.flatnonzero(inverse == position)
+                anomalies[index] = model.predict_batch(values[index])
+
+        versions = [used_version for _, used_version in loaded]
+        model_versions = [versions[position] for position in inverse.tolist()]
+
+        self.metrics_exporter.record_inference_latency_ns(time.perf_counter_ns() - start_ns)
+        self.metrics_exporter.record_inference_batch_size(len(items))
+
+        return PredictBatchResponse.model_construct(
+            anomalies=anomalies.tolist(),
+            model_versions=model_versions
+        )
+
+    def _load_model(
+        self, series_id: str, version: Optional[str] = None
+    ) -> tuple[BaseAnomalyModel, str]:
+        """Loads a model, from the model cache when possible, else from storage."""
+        if self.model_cache is None:
+            return self._load_model_from_storage(series_id, version)
+
+        # Resolve "latest" first so the key names an immutable version, even across workers
+        if version is None:
+            version = self.model_storage.get_latest_version(series_id)
+            if version is None:
+                logger.warning("Model not found for series_id='%s', version='None'", series_id)
+                raise ModelNotFoundError(series_id)
+
+        cache_key = (series_id, version)
+        model = self.model_cache.get(cache_key)
+        self.metrics_exporter.record_model_cache_access(model is not None)
+        if model is not None:
+            return model, version
+
+        loaded = self._load_model_from_storage(series_id, version)
+        self.model_cache.set(cache_key, loaded[0])
+        return loaded
+
+    def _load_model_from_storage(
+        self, series_id: str, version: Optional[str] = None
+    ) -> tuple[BaseAnomalyModel, str]:
+        """Loads a model from storage, mapping a missing model to ModelNotFoundError."""
+        try:
+            return self.model_storage.load_model(series_id, version)
+        except FileNotFoundError as exc:
+            logger.warning(
+                "Model not found for series_id='%s', version='%s'", series_id, version
+            )
+            raise ModelNotFoundError(series_id, version) from exc
+
     def get_trained_series_count(self) -> int:
-        """Returns number of trained series."""
-        return len(self.model_storage.list_all_series())
+        """Returns number of trained series, reusing a count younger than two seconds."""
+        count = self._series_count_cache.get("count")
+        if count is None:
+            count = len(self.model_storage.list_all_series())
+            self._series_count_cache.set("count", count)
+        return count
@@ -2,7 +2,9 @@
 Abstract base class for training services.
 """
 from abc import ABC, abstractmethod
+from typing import Dict, List
 from src.models.schemas import TrainData, TrainResponse
+from src.exceptions import AnomalyDetectionError
 
 
 class BaseTrainingService(ABC):  # pylint: disable=too-few-public-methods
@@ -21,3 +23,18 @@ class BaseTrainingService(ABC):  # pylint: disable=too-few-public-methods
         Returns:
             TrainResponse with training results
         """
+
+    def train_batch(self, series_data: Dict[str, TrainData]) -> List[TrainResponse]:
+        """
+        Train models for several series in one call.
+
+        Args:
+            series_data: Training data keyed by series identifier
+
+        Returns:
+            TrainResponse per series, in input order
+        """
+        raise AnomalyDetectionError(
+            "Batch training is not supported by the configured training service",
+            status_code=501
+        )
@@ -0,0 +1,90 @@
+"""
+Micro-batching of single-point predictions.
+"""
+import asyncio
+from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+from src.models.schemas import PredictResponse
+from src.services.anomaly_service import AnomalyDetectionService
+
+
+class PredictionBatcher:
+    """Coalesces concurrent /predict calls into one vectorized call per series."""
+
+    def __init__(self,
+                 anomaly_service: AnomalyDetectionService,
+                 max_batch_size: int = 64,
+                 max_latency_ms: float = 10.0):
+        self.anomaly_service = anomaly_service
+        self.max_batch_size = max_batch_size
+        self.max_latency_s = max_latency_ms / 1000
+        self._pending: list[tuple[str, Optional[str], float, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(
+        self, series_id: str, version: Optional[str], value: float
+    ) -> PredictResponse:
+        """Queues one point and waits for the batch it lands in to be scored."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((series_id, version, value, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_latency_s, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Hands every pending point to a scoring task."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.ensure_future(self._score(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _score(self, batch: list[tuple[str, Optional[str], float, asyncio.Future]]) -> None:
+        """Scores a batch off the event loop and resolves each waiting future."""
+        groups: dict[tuple[str, Optional[str]], list[int]] = {}
+        for position, (series_id, version, _, _) in enumerate(batch):
+            groups.setdefault((series_id, version), []).append(position)
+
+        try:
+            outcomes = await run_in_threadpool(self._score_groups, batch, groups)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            outcomes = {key: exc for key in groups}
+
+        for key, positions in groups.items():
+            outcome = outcomes[key]
+            for offset, position in enumerate(positions):
+                future = batch[position][3]
+                if future.done():
+                    continue
+                if isinstance(outcome, Exception):
+                    future.set_exception(outcome)
+                else:
+                    future.set_result(PredictResponse.model_construct(
+                        anomaly=outcome.anomalies[offset],
+                        model_version=outcome.model_version
+                    ))
+
+    def _score_groups(self, batch, groups) -> dict:
+        """Runs one predict_series_batch per (series_id, version), capturing failures."""
+        outcomes = {}
+        for (series_id, version), positions in groups.items():
+            values = [batch[position][2] for position in positions]
+            try:
+                outcomes[(series_id, version)] = self.anomaly_service.predict_series_batch(
+                    series_id, values, version
+                )
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                outcomes[(series_id, version)] = exc
+        return outcomes
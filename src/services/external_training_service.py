@@ -2,8 +2,11 @@
 External API training service implementation.
 """
 import time
-from typing import Optional
-import requests
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+import httpx
+import numpy as np
+import orjson
 from src.services.base_training_service import BaseTrainingService
 from src.models.schemas import TrainData, TrainResponse
 from src.utils.base_metrics import BaseMetricsExporter
@@ -18,7 +21,8 @@ class ExternalTrainingService(BaseTrainingService):  # pylint: disable=too-few-p
                  api_url: str,
                  metrics_exporter: BaseMetricsExporter,
                  api_key: Optional[str] = None,
-                 timeout: int = 30):
+                 timeout: int = 30,
+                 max_concurrent_requests: int = 16):
         """
         Initialize external training service.
 
@@ -27,11 +31,35 @@ class ExternalTrainingService(BaseTrainingService):  # pylint: disable=too-few-p
             metrics_exporter: Metrics exporter instance
             api_key: Optional API key for authentication
             timeout: Request timeout in seconds
+            max_concurrent_requests: Parallel requests issued by train_batch
         """
         self.api_url = api_url.rstrip('/')
+        self._train_url = f"{self.api_url}/train"
         self.api_key = api_key
         self.timeout = timeout
         self.metrics_exporter = metrics_exporter
+        headers = {"Content-Type": "application/json"}
+        if api_key:
+            headers["Authorization"] = f"Bearer {api_key}"
+        # One pooled client for the service's lifetime keeps connections (and TLS) alive.
+        # Only failed connects are retried: a POST /train that reached the API may have run.
+        self._client = httpx.Client(
+            headers=headers,
+            timeout=timeout,
+            transport=httpx.HTTPTransport(
+                retries=2,
+                limits=httpx.Limits(max_keepalive_connections=16, max_connections=64)
+            )
+        )
+        # httpx.Client is thread-safe, so batch requests share its connection pool
+        self._batch_executor = ThreadPoolExecutor(
+            max_workers=max_concurrent_requests, thread_name_prefix="external-train"
+        )
+
+    def close(self) -> None:
+        """Closes pooled connections to the external API."""
+        self._batch_executor.shutdown(wait=False, cancel_futures=True)
+        self._client.close()
 
     def train(self, series_id: str, train_data: TrainData, metadata: dict = None) -> TrainResponse:
         """
@@ -45,23 +73,55 @@ class ExternalTrainingService(BaseTrainingService):  # pylint: disable=too-few-p
         Returns:
             TrainResponse with training results from external API
         """
-        start_time = time.time()
-
-        # Prepare payload
-        payload = {
-            "series_id": series_id,
-            "timestamps": train_data.timestamps,
-            "values": train_data.values,
-            "metadata": metadata or {}
-        }
-
-        # Prepare headers
-        headers = {"Content-Type": "application/json"}
-        if self.api_key:
-            headers["Authorization"] = f"Bearer {self.api_key}"
+        start_ns = time.perf_counter_ns()
+
+        result = self._post_train(
+            series_id, train_data.timestamps_array, train_data.values_array, metadata
+        )
+
+        self.metrics_exporter.record_training_latency_ns(time.perf_counter_ns() - start_ns)
+
+        return result
+
+    def train_batch(self, series_data: Dict[str, TrainData]) -> List[TrainResponse]:
+        """Sends every series to the external API concurrently over the pooled client."""
+        start_ns = time.perf_counter_ns()
+
+        results = list(self._batch_executor.map(
+            self._post_train_data, series_data.keys(), series_data.values()
+        ))
+
+        self.metrics_exporter.record_training_latency_ns(time.perf_counter_ns() - start_ns)
+
+        return results
+
+    def _post_train_data(self, series_id: str, train_data: TrainData) -> TrainResponse:
+        """POSTs one batch entry with its own timestamps and values."""
+        return self._post_train(
+            series_id, train_data.timestamps_array, train_data.values_array, None
+        )
+
+    def _post_train(
+        self,
+        series_id: str,
+        timestamps: np.ndarray,
+        values: np.ndarray,
+        metadata: Optional[dict]
+    ) -> TrainResponse:
+        """POSTs one series to the external API, mapping failures to AnomalyDetectionError."""
+        # Serialize straight from the numpy arrays; orjson encodes them in C
+        body = orjson.dumps(
+            {
+                "series_id": series_id,
+                "timestamps": timestamps,
+                "values": values,
+                "metadata": metadata or {}
+            },
+            option=orjson.OPT_SERIALIZE_NUMPY
+        )
 
         try:
-            logger.info(
+            logger.debug(
                 "Sending training request to external API for series_id='%s'",
                 series_id
             )
@@ -69,20 +129,12 @@ class ExternalTrainingService(BaseTrainingService):  # pylint: disable=too-few-p
             # Send request to external API
             # for the future, the request has to be async
             # and use webhooks or polling to get the result.
-            response = requests.post(
-                f"{self.api_url}/train",
-                json=payload,
-                headers=headers,
-                timeout=self.timeout
-            )
+            response = self._client.post(self._train_url, content=body)
             response.raise_for_status()
 
             result = response.json()
 
-            latency_ms = (time.time() - start_time) * 1000
-            self.metrics_exporter.record_training_latency(latency_ms)
-
-            logger.info(
+            logger.debug(
                 "External training completed for series_id='%s', version='%s'",
                 series_id, result.get("version")
             )
@@ -91,10 +143,10 @@ class ExternalTrainingService(BaseTrainingService):  # pylint: disable=too-few-p
             return TrainResponse(
                 series_id=result.get("series_id", series_id),
                 version=result.get("version", "external-unknown"),
-                points_used=result.get("points_used", len(train_data.values))
+                points_used=result.get("points_used", len(values))
             )
 
-        except requests.exceptions.Timeout as e:
+        except httpx.TimeoutException as e:
             logger.error(
                 "Timeout calling external training API for series_id='%s'",
                 series_id
@@ -104,20 +156,20 @@ class ExternalTrainingService(BaseTrainingService):  # pylint: disable=too-few-p
                 status_code=504
             ) from e
 
-        except requests.exceptions.HTTPError as e:
+        except httpx.HTTPStatusError as e:
             logger.error(
                 "HTTP error from external training API for series_id='%s': %s",
-                series_id, str(e)
+                series_id, e
             )
             raise AnomalyDetectionError(
                 f"External training API error: {e.response.text}",
                 status_code=e.response.status_code
             ) from e
 
-        except requests.exceptions.RequestException as e:
+        except httpx.RequestError as e:
             logger.error(
                 "Request error calling external training API for series_id='%s': %s",
-                series_id, str(e)
+                series_id, e
             )
             raise AnomalyDetectionError(
                 f"Failed to connect to external training API: {str(e)}",
@@ -127,7 +179,7 @@ class ExternalTrainingService(BaseTrainingService):  # pylint: disable=too-few-p
         except Exception as e:
             logger.error(
                 "Unexpected error calling external training API for series_id='%s': %s",
-                series_id, str(e), exc_info=True
+                series_id, e, exc_info=True
             )
             raise AnomalyDetectionError(
                 f"Unexpected error during external training: {str(e)}",
@@ -1,13 +1,17 @@
 """
 Local training service implementation.
 """
+import hashlib
+import threading
 import time
+from concurrent.futures import Future
+from typing import Dict, List, Tuple
 from src.services.base_training_service import BaseTrainingService
 from src.models.schemas import TrainData, TrainResponse
 from src.anomaly_models.model_factory import ModelFactory
 from src.storage.base_storage import BaseModelStorage
 from src.utils.base_metrics import BaseMetricsExporter
-from src.config import config
+from src.config import get_config
 
 
 class LocalTrainingService(BaseTrainingService):  # pylint: disable=too-few-public-methods
@@ -17,25 +21,81 @@ class LocalTrainingService(BaseTrainingService):  # pylint: disable=too-few-publ
                  metrics_exporter: BaseMetricsExporter):
         self.model_storage = model_storage
         self.metrics_exporter = metrics_exporter
+        # Trainings in progress, keyed by series and data, that identical requests can join
+        self._inflight: Dict[Tuple[str, bytes], Future] = {}
+        self._inflight_lock = threading.Lock()
 
     def train(self, series_id: str, train_data: TrainData, metadata: dict = None) -> TrainResponse:
-        """Trains model locally using factory to create configured type."""
-        start_time = time.time()
+        """Trains model locally, sharing one run between concurrent identical requests."""
+        digest = hashlib.blake2b(train_data.timestamps_array.tobytes(), digest_size=16)
+        digest.update(train_data.values_array.tobytes())
+        key = (series_id, digest.digest())
+
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+
+        if not owner:
+            self.metrics_exporter.record_coalesced_training()
+            return future.result()
 
-        time_series = train_data.to_time_series()
+        try:
+            result = self._train(series_id, train_data)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+
+        future.set_result(result)
+        return result
+
+    def _train(self, series_id: str, train_data: TrainData) -> TrainResponse:
+        """Trains model locally using factory to create configured type."""
+        start_ns = time.perf_counter_ns()
 
         # Get model specific config
+        config = get_config()
         model_config = getattr(config, config.model_type)
         model = ModelFactory.create(config.model_type, **model_config.model_dump())
-        model.fit(time_series)
+        model.fit_values(train_data.values_array)
 
         version = self.model_storage.save_model(series_id, model)
 
-        latency_ms = (time.time() - start_time) * 1000
-        self.metrics_exporter.record_training_latency(latency_ms)
+        self.metrics_exporter.record_training_latency_ns(time.perf_counter_ns() - start_ns)
 
-        return TrainResponse(
+        # Every field comes from validated input or storage; skip revalidating them
+        return TrainResponse.model_construct(
             series_id=series_id,
             version=version,
             points_used=len(train_data.values)
         )
+
+    def train_batch(self, series_data: Dict[str, TrainData]) -> List[TrainResponse]:
+        """Fits one model per series in-process and persists them together."""
+        start_ns = time.perf_counter_ns()
+
+        config = get_config()
+        model_config = getattr(config, config.model_type).model_dump()
+        models = {
+            series_id: ModelFactory.create(config.model_type, **model_config).fit_values(
+                train_data.values_array
+            )
+            for series_id, train_data in series_data.items()
+        }
+
+        versions = self.model_storage.save_models(models)
+
+        self.metrics_exporter.record_training_latency_ns(time.perf_counter_ns() - start_ns)
+
+        return [
+            TrainResponse.model_construct(
+                series_id=series_id,
+                version=versions[series_id],
+                points_used=len(train_data.values)
+            )
+            for series_id, train_data in series_data.items()
+        ]
@@ -0,0 +1,48 @@
+"""
+In-process registry of background training jobs.
+"""
+import uuid
+from typing import Callable, Optional
+from src.models.schemas import TrainJobResponse, TrainResponse
+from src.exceptions import AnomalyDetectionError
+from src.utils.logger import logger, log_exc_sampled
+from src.utils.ttl_cache import TTLCache
+
+
+class TrainingJobStore:
+    """Tracks background /fit jobs so clients can poll for their result."""
+
+    def __init__(self, max_jobs: int = 10000, ttl_seconds: float = 3600.0):
+        self._jobs = TTLCache(max_entries=max_jobs, ttl_seconds=ttl_seconds)
+
+    def create(self, series_id: str) -> TrainJobResponse:
+        """Registers a pending job for series_id."""
+        job = TrainJobResponse.model_construct(
+            job_id=uuid.uuid4().hex, series_id=series_id, status="pending"
+        )
+        self._jobs.set(job.job_id, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[TrainJobResponse]:
+        """Returns the job, or None if unknown or expired."""
+        return self._jobs.get(job_id)
+
+    def run(self, job_id: str, train: Callable[..., TrainResponse], *args) -> None:
+        """Runs train(*args) and records its outcome on the job."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+
+        try:
+            result = train(*args)
+        except AnomalyDetectionError as e:
+            logger.error("Background training job '%s' failed: %s", job_id, e.message)
+            self._jobs.set(job_id, job.model_copy(update={"status": "failed", "detail": e.message}))
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            log_exc_sampled(logger, e, "Unexpected error in background training job '%s': %s",
+                            job_id, e)
+            self._jobs.set(job_id, job.model_copy(
+                update={"status": "failed", "detail": "Internal server error during training"}
+            ))
+        else:
+            self._jobs.set(job_id, job.model_copy(update={"status": "done", "result": result}))
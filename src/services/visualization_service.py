@@ -1,23 +1,218 @@
 """
 Visualization service using abstract storage.
 """
+import asyncio
+import html
 import io
-from typing import Optional
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt  # noqa: E402 pylint: disable=wrong-import-position
-from src.storage.base_storage import BaseModelStorage  # noqa: E402 pylint: disable=wrong-import-position
-from src.exceptions import ModelNotFoundError  # noqa: E402 pylint: disable=wrong-import-position
-from src.utils.logger import logger  # noqa: E402 pylint: disable=wrong-import-position
+import threading
+from concurrent.futures import Executor
+from typing import NamedTuple, Optional, Tuple
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from fastapi.concurrency import run_in_threadpool
+from src.storage.base_storage import BaseModelStorage
+from src.exceptions import ModelNotFoundError
+from src.utils.logger import logger
+from src.utils.ttl_cache import TTLCache
 
+# Rendered plots kept per (series_id, version, format); versions are immutable
+_PLOT_CACHE_SIZE = 256
 
-class VisualizationService:  # pylint: disable=too-few-public-methods
+# One reusable Figure per rendering thread (and so per pool worker process)
+_figures = threading.local()
+
+
+def _plot_axes():
+    """Returns this thread's cleared Axes, building its Agg-backed Figure on first use."""
+    ax = getattr(_figures, 'ax', None)
+    if ax is None:
+        # Agg canvas bound directly, without pyplot's global (non thread-safe) figure state
+        fig = Figure(figsize=(12, 6))
+        FigureCanvasAgg(fig)
+        fig.set_layout_engine('tight')
+        ax = _figures.ax = fig.add_subplot()
+    else:
+        ax.clear()
+    return ax
+
+
+class PlotStats(NamedTuple):
+    """Fitted values a plot draws, read once from the model's cached attributes."""
+    mean: float
+    std: float
+    threshold: float
+    lower_bound: float
+    upper_bound: float
+
+
+def render_plot(series_id: str, version: str, stats: PlotStats, img_format: str) -> bytes:
+    """
+    Render the anomaly bounds plot for a fitted model's statistics.
+
+    Top-level and stateless so it can run in a process pool worker.
+    """
+    ax = _plot_axes()
+
+    mean, std, _, lower_bound, upper_bound = stats
+
+    ax.axhline(
+        y=mean, color='blue', linestyle='-', linewidth=2,
+        label=f'Mean ({mean:.2f})'
+    )
+    ax.axhline(
+        y=upper_bound, color='red', linestyle='--', linewidth=1.5,
+        label=f'Upper Bound ({upper_bound:.2f})'
+    )
+    ax.axhline(
+        y=lower_bound, color='red', linestyle='--', linewidth=1.5,
+        label=f'Lower Bound ({lower_bound:.2f})'
+    )
+
+    ax.fill_between([0, 1], lower_bound, upper_bound, alpha=0.2, color='green',
+                    label='Normal Range')
+
+    ax.set_xlabel('Data Points', fontsize=12)
+    ax.set_ylabel('Value', fontsize=12)
+    ax.set_title(
+        f'Time Series: {series_id} (Version: {version})',
+        fontsize=14, fontweight='bold'
+    )
+    ax.legend(loc='best')
+    ax.grid(True, alpha=0.3)
+
+    stats_text = f'μ = {mean:.4f}\nσ = {std:.4f}\nThreshold = μ ± {stats.threshold:g}σ'
+    ax.text(
+        0.02, 0.98, stats_text, transform=ax.transAxes,
+        fontsize=10, verticalalignment='top',
+        bbox={'boxstyle': 'round', 'facecolor': 'wheat', 'alpha': 0.5}
+    )
+
+    buf = io.BytesIO()
+    ax.figure.savefig(buf, format=img_format, dpi=100, bbox_inches='tight')
+    return buf.getvalue()
+
+
+# Fixed SVG canvas matching the 12x6in @ 100dpi matplotlib plot, and its plot area
+_SVG_WIDTH, _SVG_HEIGHT = 1200, 600
+_SVG_LEFT, _SVG_RIGHT, _SVG_TOP, _SVG_BOTTOM = 80, 1180, 50, 550
+
+
+def render_svg(series_id: str, version: str, stats: PlotStats) -> bytes:
+    """
+    Render the bounds-only plot as SVG from a text template, without matplotlib.
+
+    The plot has no data series, only three lines, a band and two text boxes.
+    """
+    mean, std, threshold, lower_bound, upper_bound = stats
+    span = upper_bound - lower_bound
+    pad = span * 0.1 if span > 0 else max(abs(mean) * 0.1, 1.0)
+    y_min, y_max = lower_bound - pad, upper_bound + pad
+    scale = (_SVG_BOTTOM - _SVG_TOP) / (y_max - y_min)
+
+    def y(value: float) -> float:
+        return round(_SVG_BOTTOM - (value - y_min) * scale, 2)
+
+    y_mean, y_upper, y_lower = y(mean), y(upper_bound), y(lower_bound)
+    title = html.escape(f'Time Series: {series_id} (Version: {version})')
+    return f"""<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {_SVG_WIDTH} {_SVG_HEIGHT}" \
+width="{_SVG_WIDTH}" height="{_SVG_HEIGHT}" font-family="DejaVu Sans, sans-serif">
+<rect width="100%" height="100%" fill="white"/>
+<text x="{_SVG_WIDTH / 2}" y="30" font-size="18" font-weight="bold" \
+text-anchor="middle">{title}</text>
+<rect x="{_SVG_LEFT}" y="{_SVG_TOP}" width="{_SVG_RIGHT - _SVG_LEFT}" \
+height="{_SVG_BOTTOM - _SVG_TOP}" fill="none" stroke="black"/>
+<rect x="{_SVG_LEFT}" y="{y_upper}" width="{_SVG_RIGHT - _SVG_LEFT}" \
+height="{round(y_lower - y_upper, 2)}" fill="green" fill-opacity="0.2"/>
+<line x1="{_SVG_LEFT}" x2="{_SVG_RIGHT}" y1="{y_mean}" y2="{y_mean}" stroke="blue" \
+stroke-width="2"/>
+<line x1="{_SVG_LEFT}" x2="{_SVG_RIGHT}" y1="{y_upper}" y2="{y_upper}" stroke="red" \
+stroke-width="1.5" stroke-dasharray="6 4"/>
+<line x1="{_SVG_LEFT}" x2="{_SVG_RIGHT}" y1="{y_lower}" y2="{y_lower}" stroke="red" \
+stroke-width="1.5" stroke-dasharray="6 4"/>
+<text x="{_SVG_LEFT - 8}" y="{y_mean}" font-size="11" text-anchor="end" \
+dominant-baseline="middle">{mean:.2f}</text>
+<text x="{_SVG_LEFT - 8}" y="{y_upper}" font-size="11" text-anchor="end" \
+dominant-baseline="middle">{upper_bound:.2f}</text>
+<text x="{_SVG_LEFT - 8}" y="{y_lower}" font-size="11" text-anchor="end" \
+dominant-baseline="middle">{lower_bound:.2f}</text>
+<text x="{_SVG_WIDTH / 2}" y="{_SVG_HEIGHT - 20}" font-size="14" \
+text-anchor="middle">Data Points</text>
+<text x="20" y="{_SVG_HEIGHT / 2}" font-size="14" text-anchor="middle" \
+transform="rotate(-90 20 {_SVG_HEIGHT / 2})">Value</text>
+<rect x="{_SVG_LEFT + 10}" y="{_SVG_TOP + 10}" width="170" height="62" rx="5" \
+fill="wheat" fill-opacity="0.5" stroke="black" stroke-opacity="0.5"/>
+<text x="{_SVG_LEFT + 18}" y="{_SVG_TOP + 28}" font-size="12">μ = {mean:.4f}</text>
+<text x="{_SVG_LEFT + 18}" y="{_SVG_TOP + 46}" font-size="12">σ = {std:.4f}</text>
+<text x="{_SVG_LEFT + 18}" y="{_SVG_TOP + 64}" font-size="12">\
+Threshold = μ ± {threshold:g}σ</text>
+<g font-size="12" transform="translate({_SVG_RIGHT - 200} {_SVG_TOP + 10})">
+<rect width="190" height="86" rx="5" fill="white" fill-opacity="0.8" stroke="#ccc"/>
+<line x1="10" x2="40" y1="16" y2="16" stroke="blue" stroke-width="2"/>
+<text x="48" y="20">Mean ({mean:.2f})</text>
+<line x1="10" x2="40" y1="36" y2="36" stroke="red" stroke-dasharray="6 4"/>
+<text x="48" y="40">Upper Bound ({upper_bound:.2f})</text>
+<line x1="10" x2="40" y1="56" y2="56" stroke="red" stroke-dasharray="6 4"/>
+<text x="48" y="60">Lower Bound ({lower_bound:.2f})</text>
+<rect x="10" y="70" width="30" height="10" fill="green" fill-opacity="0.2"/>
+<text x="48" y="80">Normal Range</text>
+</g>
+</svg>
+""".encode('utf-8')
+
+
+class VisualizationService:
     """Visualization service using abstract storage."""
 
-    def __init__(self, model_storage: BaseModelStorage):
+    def __init__(self, model_storage: BaseModelStorage, render_pool: Optional[Executor] = None):
         self.model_storage = model_storage
+        self.render_pool = render_pool
+        self._plot_cache = TTLCache(max_entries=_PLOT_CACHE_SIZE, ttl_seconds=None)
+
+    def close(self) -> None:
+        """Shuts down the render pool, if any."""
+        if self.render_pool is not None:
+            self.render_pool.shutdown(wait=False, cancel_futures=True)
 
-    def plot_time_series(
+    def _load_model_stats(
+        self, series_id: str, version: Optional[str]
+    ) -> Tuple[PlotStats, str]:
+        """Loads a model and returns the stats a plot needs, with the version used."""
+        try:
+            model, used_version = self.model_storage.load_model(series_id, version)
+        except FileNotFoundError as exc:
+            logger.warning(
+                "Model not found for visualization: series_id='%s', version='%s'",
+                series_id, version
+            )
+            raise ModelNotFoundError(series_id, version) from exc
+        stats = PlotStats(
+            mean=model.mean,
+            std=model.std,
+            threshold=model.threshold,
+            lower_bound=model.lower_bound,
+            upper_bound=model.upper_bound
+        )
+        return stats, used_version
+
+    def resolve_version(self, series_id: str, version: Optional[str] = None) -> str:
+        """
+        Resolve the model version a plot would use, without rendering it.
+
+        Raises:
+            ModelNotFoundError: If model for series_id (and version) doesn't exist
+        """
+        if version is None:
+            resolved = self.model_storage.get_latest_version(series_id)
+        elif self.model_storage.model_exists(series_id, version):
+            resolved = version
+        else:
+            resolved = None
+
+        if resolved is None:
+            raise ModelNotFoundError(series_id, version)
+        return resolved
+
+    async def render_time_series(
         self,
         series_id: str,
         version: Optional[str] = None,
@@ -26,6 +221,10 @@ class VisualizationService:  # pylint: disable=too-few-public-methods
         """
         Generate a plot of the time series with anomaly detection boundaries.
 
+        Model loading and rendering stay off the event loop: PNG/JPG rendering runs in
+        the process pool when one is configured, else in the threadpool; SVG is templated
+        inline.
+
         Args:
             series_id: Identifier for the time series
             version: Optional model version, uses latest if not provided
@@ -37,63 +236,31 @@ class VisualizationService:  # pylint: disable=too-few-public-methods
         Raises:
             ModelNotFoundError: If model for series_id doesn't exist
         """
-        try:
-            model, used_version = self.model_storage.load_model(series_id, version)
-        except FileNotFoundError as exc:
-            logger.warning(
-                "Model not found for visualization: series_id='%s', version='%s'",
-                series_id, version
-            )
-            raise ModelNotFoundError(series_id, version) from exc
-
-        fig, ax = plt.subplots(figsize=(12, 6))
-
-        mean = model.mean
-        std = model.std
-        upper_bound = mean + 3 * std
-        lower_bound = mean - 3 * std
-
-        ax.axhline(
-            y=mean, color='blue', linestyle='-', linewidth=2,
-            label=f'Mean ({mean:.2f})'
-        )
-        ax.axhline(
-            y=upper_bound, color='red', linestyle='--', linewidth=1.5,
-            label=f'Upper Bound ({upper_bound:.2f})'
-        )
-        ax.axhline(
-            y=lower_bound, color='red', linestyle='--', linewidth=1.5,
-            label=f'Lower Bound ({lower_bound:.2f})'
-        )
+        cache_key = (series_id, version, img_format)
+        if version is not None:
+            cached = self._plot_cache.get(cache_key)
+            if cached is not None:
+                return cached
 
-        ax.fill_between([0, 1], lower_bound, upper_bound, alpha=0.2, color='green',
-                        label='Normal Range')
-
-        ax.set_xlabel('Data Points', fontsize=12)
-        ax.set_ylabel('Value', fontsize=12)
-        ax.set_title(
-            f'Time Series: {series_id} (Version: {used_version})',
-            fontsize=14, fontweight='bold'
-        )
-        ax.legend(loc='best')
-        ax.grid(True, alpha=0.3)
-
-        stats_text = f'μ = {mean:.4f}\nσ = {std:.4f}\nThreshold = μ ± 3σ'
-        ax.text(
-            0.02, 0.98, stats_text, transform=ax.transAxes,
-            fontsize=10, verticalalignment='top',
-            bbox={'boxstyle': 'round', 'facecolor': 'wheat', 'alpha': 0.5}
+        stats, used_version = await run_in_threadpool(
+            self._load_model_stats, series_id, version
         )
+        if img_format == 'svg':
+            # Text templating is microseconds of work; no need to leave the event loop
+            image_bytes = render_svg(series_id, used_version, stats)
+        elif self.render_pool is not None:
+            image_bytes = await asyncio.get_running_loop().run_in_executor(
+                self.render_pool, render_plot, series_id, used_version, stats, img_format
+            )
+        else:
+            image_bytes = await run_in_threadpool(
+                render_plot, series_id, used_version, stats, img_format
+            )
 
-        buf = io.BytesIO()
-        plt.tight_layout()
-        plt.savefig(buf, format=img_format, dpi=100, bbox_inches='tight')
-        plt.close(fig)
-        buf.seek(0)
-
-        logger.info(
+        logger.debug(
             "Generated plot for series_id='%s', version='%s'",
             series_id, used_version
         )
 
-        return buf.read()
+        self._plot_cache.set((series_id, used_version, img_format), image_bytes)
+        return image_bytes
@@ -2,7 +2,7 @@
 Base interface for different storage backends.
 """
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Dict, Optional, List
 from src.anomaly_models.base_model import BaseAnomalyModel
 
 
@@ -14,6 +14,13 @@ class BaseModelStorage(ABC):
                    version: Optional[str] = None) -> str:
         """Persists the model and returns the version."""
 
+    def save_models(self, models: Dict[str, BaseAnomalyModel]) -> Dict[str, str]:
+        """Persists several series' models, returning the version per series."""
+        return {
+            series_id: self.save_model(series_id, model)
+            for series_id, model in models.items()
+        }
+
     @abstractmethod
     def load_model(self, series_id: str,
                    version: Optional[str] = None) -> tuple[BaseAnomalyModel, str]:
@@ -1,45 +1,199 @@
 """
 Model storage in local filesystem (original implementation).
 """
-import json
+import hashlib
+import mmap
 import os
+import struct
 import tempfile
+import time
 from typing import Optional, List
 from pathlib import Path
-from datetime import datetime
+import orjson
 from filelock import FileLock
 from src.storage.base_storage import BaseModelStorage
 from src.anomaly_models.base_model import BaseAnomalyModel
 from src.anomaly_models.model_factory import ModelFactory
 from src.utils.logger import logger
+from src.utils.rw_lock import ReadersWriterLock
+from src.utils.ttl_cache import TTLCache
+
+# Per-series index: (count, latest version number) as little-endian uint64s
+_INDEX_STRUCT = struct.Struct("<QQ")
+
+# Model files at least this large are mapped instead of read into a bytes copy
+_MMAP_MIN_BYTES = 64 * 1024
+
+_LOCK_SHARDS = 64
+
+_LOADED_MODELS_MAX = 256
+
+# Temporary name for series directories being moved into their shard
+_MIGRATING_PREFIX = ".migrating-"
+
+# Metadata is kept in this xattr on the model file; .meta.json is the fallback
+_METADATA_XATTR = "user.model.meta"
+
+# (epoch second, its "%Y-%m-%dT%H:%M:%S" UTC rendering), reformatted when the second ticks
+_saved_at_prefix: tuple[int, str] = (-1, "")
+
+
+def _utc_isoformat() -> str:
+    """Current UTC time in datetime.isoformat() layout with microseconds."""
+    global _saved_at_prefix  # pylint: disable=global-statement
+    now_ns = time.time_ns()
+    second, prefix = _saved_at_prefix
+    if now_ns // 1_000_000_000 != second:
+        second = now_ns // 1_000_000_000
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _saved_at_prefix = (second, prefix)
+    return f"{prefix}.{now_ns // 1000 % 1_000_000:06d}"
+
+
+def _model_version_number(entry: os.DirEntry) -> Optional[int]:
+    """Returns N for a v<N>.bin model file, or None for anything else (index.bin included)."""
+    name = entry.name
+    if name.endswith(".bin") and name[:1] == "v" and name[1:-4].isdigit() and entry.is_file():
+        return int(name[1:-4])
+    return None
 
 
 class FilesystemModelStorage(BaseModelStorage):
     """Stores models in JSON on local disk."""
 
-    def __init__(self, storage_path: str = "./model_storage"):
+    def __init__(self, storage_path: str = "./model_storage", fsync: bool = False):
         self.storage_path = Path(storage_path)
+        # When set, file data is flushed before each rename and the directory after a commit
+        self.fsync = fsync
         self.storage_path.mkdir(parents=True, exist_ok=True)
 
         self.locks_path = self.storage_path / ".locks"
         self.locks_path.mkdir(parents=True, exist_ok=True)
 
+        # Readers share an in-process lock; only writers also take the cross-process FileLock
+        self._series_locks = [ReadersWriterLock() for _ in range(_LOCK_SHARDS)]
+
+        # Directory listings are reused while the directory mtimes they were read at hold
+        self._series_list_cache: Optional[tuple[List[str], dict[str, int]]] = None
+        self._versions_cache = TTLCache(max_entries=1024, ttl_seconds=None)
+        # FileLock objects are reused per series rather than built on every save
+        self._file_locks = TTLCache(max_entries=1024, ttl_seconds=None)
+        # Parsed models, keyed by the identity of the file they were read from
+        self._loaded_models = TTLCache(max_entries=_LOADED_MODELS_MAX, ttl_seconds=None)
+
+        self.migrate_flat_layout()
+
+    @staticmethod
+    def _get_shard(series_id: str) -> str:
+        """Two hex chars of a hash of series_id, spreading series over 256 directories."""
+        return hashlib.blake2b(series_id.encode(), digest_size=1).hexdigest()
+
     def _get_series_dir(self, series_id: str) -> Path:
-        series_dir = self.storage_path / series_id
+        series_dir = self.storage_path / self._get_shard(series_id) / series_id
         series_dir.mkdir(parents=True, exist_ok=True)
         return series_dir
 
+    @staticmethod
+    def _has_models(directory: str) -> bool:
+        with os.scandir(directory) as entries:
+            return any(_model_version_number(entry) is not None for entry in entries)
+
+    def migrate_flat_layout(self) -> None:
+        """Moves series saved directly under storage_path into their shard directories."""
+        marker_path = self.storage_path / ".sharded"
+        if marker_path.exists():
+            return
+
+        for entry in os.scandir(self.storage_path):
+            if entry.name == ".locks" or not entry.is_dir() or not self._has_models(entry.path):
+                continue
+
+            # Shard directories hold only directories, so this is a pre-sharding series
+            if entry.name.startswith(_MIGRATING_PREFIX):
+                series_id = entry.name[len(_MIGRATING_PREFIX):]  # resumes an interrupted move
+            else:
+                series_id = entry.name
+            staging_path = self.storage_path / f"{_MIGRATING_PREFIX}{series_id}"
+            target_dir = self.storage_path / self._get_shard(series_id) / series_id
+            try:
+                with self._get_file_lock(series_id):
+                    # Via a staging name, as the shard may share the series directory's name
+                    if entry.path != str(staging_path):
+                        os.rename(entry.path, staging_path)
+                    target_dir.parent.mkdir(parents=True, exist_ok=True)
+                    os.rename(staging_path, target_dir)
+            except OSError as e:
+                logger.warning("Could not migrate series '%s' to sharded layout: %s",
+                               series_id, e)
+                return
+            logger.info("Migrated series '%s' to %s", series_id, target_dir)
+
+        self._atomic_write_bytes(marker_path, b"")
+
     def _get_lock_path(self, series_id: str) -> Path:
         return self.locks_path / f"{series_id}.lock"
 
-    def _generate_version(self, series_id: str) -> str:
+    def _get_file_lock(self, series_id: str) -> FileLock:
+        lock = self._file_locks.get(series_id)
+        if lock is None:
+            lock = FileLock(self._get_lock_path(series_id), timeout=10)
+            self._file_locks.set(series_id, lock)
+        return lock
+
+    def _get_series_lock(self, series_id: str) -> ReadersWriterLock:
+        return self._series_locks[hash(series_id) % _LOCK_SHARDS]
+
+    def _get_index_path(self, series_id: str) -> Path:
+        return self._get_series_dir(series_id) / "index.bin"
+
+    def _read_index(self, series_id: str, persist: bool = False) -> tuple[int, int]:
+        """Returns (count, latest version number), rebuilding it if missing.
+
+        Only writers holding the FileLock should persist a rebuilt index.
+        """
+        index_path = self._get_index_path(series_id)
+        try:
+            with open(index_path, 'rb') as f:
+                return _INDEX_STRUCT.unpack(f.read(_INDEX_STRUCT.size))
+        except (FileNotFoundError, struct.error):
+            pass
+
         versions = self._list_versions(series_id)
         if not versions:
+            return 0, 0
+
+        index = (len(versions), int(versions[-1].lstrip('v')))
+        if persist:
+            self._write_index(series_id, *index)
+        return index
+
+    def _latest_version(self, series_id: str) -> Optional[str]:
+        count, latest = self._read_index(series_id)
+        return f"v{latest}" if count else None
+
+    def _write_index(self, series_id: str, count: int, latest: int) -> None:
+        self._atomic_write_bytes(
+            self._get_index_path(series_id), _INDEX_STRUCT.pack(count, latest)
+        )
+
+    @staticmethod
+    def _generate_version(index: tuple[int, int]) -> str:
+        count, latest = index
+        if not count:
             return "v0"
 
-        latest_version = versions[-1]
-        version_number = int(latest_version.lstrip('v'))
-        return f"v{version_number + 1}"
+        return f"v{latest + 1}"
+
+    @staticmethod
+    def _next_index(index: tuple[int, int], version: str, is_new: bool) -> tuple[int, int]:
+        """Returns the index after saving version; non-numeric versions leave it unchanged."""
+        count, latest = index
+        if not (version.startswith("v") and version[1:].isdigit()):
+            return index
+
+        version_number = int(version[1:])
+        latest = max(latest, version_number) if count else version_number
+        return count + 1 if is_new else count, latest
 
     def _get_model_path(self, series_id: str, version: str) -> Path:
         return self._get_series_dir(series_id) / f"{version}.bin"
@@ -47,9 +201,9 @@ class FilesystemModelStorage(BaseModelStorage):
     def _get_metadata_path(self, series_id: str, version: str) -> Path:
         return self._get_series_dir(series_id) / f"{version}.meta.json"
 
-    def _atomic_write_bytes(self, target_path: Path, data: bytes) -> None:
+    def _write_temp_bytes(self, directory: Path, data: bytes) -> str:
         temp_fd, temp_path = tempfile.mkstemp(
-            dir=target_path.parent,
+            dir=directory,
             suffix='.tmp',
             prefix='.model_'
         )
@@ -57,76 +211,120 @@ class FilesystemModelStorage(BaseModelStorage):
         try:
             with os.fdopen(temp_fd, 'wb') as f:
                 f.write(data)
-            os.replace(temp_path, target_path)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
         except Exception:
-            try:
-                os.unlink(temp_path)
-            except OSError:
-                pass
+            self._discard_temp(temp_path)
             raise
+        return temp_path
 
-    def _atomic_write_json(self, target_path: Path, data: dict) -> None:
-        temp_fd, temp_path = tempfile.mkstemp(
-            dir=target_path.parent,
-            suffix='.tmp',
-            prefix='.meta_'
-        )
+    @staticmethod
+    def _fsync_path(path) -> None:
+        """Flushes a file's data and inode (xattrs included), or a directory's entries."""
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _fsync_dir(self, directory: Path) -> None:
+        self._fsync_path(directory)
+
+    @staticmethod
+    def _discard_temp(temp_path: str) -> None:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+
+    def _atomic_write_bytes(self, target_path: Path, data: bytes) -> None:
+        temp_path = self._write_temp_bytes(target_path.parent, data)
 
         try:
-            with os.fdopen(temp_fd, 'w') as f:
-                json.dump(data, f, indent=2)
             os.replace(temp_path, target_path)
         except Exception:
-            try:
-                os.unlink(temp_path)
-            except OSError:
-                pass
+            self._discard_temp(temp_path)
             raise
 
+    @staticmethod
+    def _set_metadata_xattr(path: str, metadata: dict) -> bool:
+        """Stores metadata as an xattr on path; False if the filesystem does not support it."""
+        if not hasattr(os, "setxattr"):
+            return False
+        try:
+            os.setxattr(path, _METADATA_XATTR, orjson.dumps(metadata))
+        except OSError:
+            return False
+        return True
+
+    def _atomic_write_json(self, target_path: Path, data: dict) -> None:
+        self._atomic_write_bytes(target_path, orjson.dumps(data))
+
     def save_model(self, series_id: str, model: BaseAnomalyModel,
                    version: Optional[str] = None) -> str:
         if not model.is_fitted():
             raise ValueError("Cannot save an unfitted model")
 
-        lock_path = self._get_lock_path(series_id)
-        lock = FileLock(lock_path, timeout=10)
-
-        with lock:
-            if version is None:
-                version = self._generate_version(series_id)
+        # Serialize and stage the model file before locking; the lock only covers commit
+        staged_path = self._write_temp_bytes(self._get_series_dir(series_id), model.save())
+        try:
+            with self._get_series_lock(series_id).write(), self._get_file_lock(series_id):
+                version = self._commit_model(series_id, model, version, staged_path)
+        except Exception:
+            self._discard_temp(staged_path)
+            raise
 
-            model_path = self._get_model_path(series_id, version)
-            metadata_path = self._get_metadata_path(series_id, version)
+        return version
 
-            # Save model as bytes
-            model_bytes = model.save()
-            self._atomic_write_bytes(model_path, model_bytes)
-
-            # Save metadata as JSON
-            metadata = {
-                "series_id": series_id,
-                "version": version,
-                "model_type": model.get_model_type(),
-                "saved_at": datetime.utcnow().isoformat()
-            }
+    def _commit_model(self, series_id: str, model: BaseAnomalyModel,
+                      version: Optional[str], staged_path: str) -> str:
+        """Assigns the version and moves a staged model into place; caller holds the locks."""
+        # Read the index before writing so a rebuild never counts the new model
+        index = self._read_index(series_id, persist=True)
+        if version is None:
+            version = self._generate_version(index)
+
+        model_path = self._get_model_path(series_id, version)
+        metadata_path = self._get_metadata_path(series_id, version)
+        is_new = not model_path.exists()
+
+        metadata = {
+            "series_id": series_id,
+            "version": version,
+            "model_type": model.get_model_type(),
+            "saved_at": _utc_isoformat()
+        }
+        # Attach metadata to the staged file so it appears with the rename
+        if self._set_metadata_xattr(staged_path, metadata):
+            if self.fsync:
+                # The staged bytes were flushed before the xattr existed; flush it too
+                self._fsync_path(staged_path)
+        else:
             self._atomic_write_json(metadata_path, metadata)
 
-            logger.info(
-                "Saved model: series_id='%s', version='%s', type='%s' to %s",
-                series_id, version, model.get_model_type(), model_path
-            )
+        os.replace(staged_path, model_path)
+        new_index = self._next_index(index, version, is_new)
+        if new_index != index:
+            self._write_index(series_id, *new_index)
+        if self.fsync:
+            # One directory flush makes all of this commit's renames durable
+            self._fsync_dir(model_path.parent)
 
+        self._series_list_cache = None
+        self._versions_cache.pop(series_id)
+
+        logger.info(
+            "Saved model: series_id='%s', version='%s', type='%s' to %s",
+            series_id, version, model.get_model_type(), model_path
+        )
         return version
 
     def load_model(self, series_id: str,
                    version: Optional[str] = None) -> tuple[BaseAnomalyModel, str]:
-        lock_path = self._get_lock_path(series_id)
-        lock = FileLock(lock_path, timeout=10)
-
-        with lock:
+        with self._get_series_lock(series_id).read():
             if version is None:
-                versions = self._list_versions(series_id)
-                version = versions[-1] if versions else None
+                version = self._latest_version(series_id)
                 if version is None:
                     logger.warning("No models found for series_id: %s", series_id)
                     raise FileNotFoundError(
@@ -137,95 +335,149 @@ class FilesystemModelStorage(BaseModelStorage):
             metadata_path = self._get_metadata_path(series_id, version)
 
             try:
-                # Load metadata
-                with open(metadata_path, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
-
-                # Load model bytes
-                with open(model_path, 'rb') as f:
-                    model_bytes = f.read()
-
-                logger.debug(
-                    "Loaded model: series_id='%s', version='%s', type='%s' from %s",
-                    series_id, version, metadata["model_type"], model_path
+                # A hit on the file's identity skips reading and parsing it again
+                cached_model = self._loaded_models.get(
+                    self._loaded_model_key(series_id, version, os.stat(model_path))
                 )
+                if cached_model is not None:
+                    return cached_model, version
+
+                # Saves replace files atomically, so this handle stays consistent after unlock
+                model_file = open(model_path, 'rb')  # pylint: disable=consider-using-with
+                file_stat = os.fstat(model_file.fileno())
+                if file_stat.st_size >= _MMAP_MIN_BYTES and hasattr(os, "posix_fadvise"):
+                    # Start readahead now so it overlaps the metadata read and unlock
+                    os.posix_fadvise(model_file.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+                try:
+                    metadata = orjson.loads(self._read_metadata(model_file, metadata_path))
+                except Exception:
+                    model_file.close()
+                    raise
             except FileNotFoundError as exc:
                 logger.warning("Model file not found: %s", model_path)
                 raise FileNotFoundError(
                     f"Model not found: {series_id}/{version}"
                 ) from exc
-            except json.JSONDecodeError as e:
+            except orjson.JSONDecodeError as e:
                 logger.error("Corrupted metadata file: %s", metadata_path)
                 raise ValueError(
                     f"Corrupted metadata: {series_id}/{version}"
                 ) from e
 
-            # Create empty model and load data
-            model = ModelFactory.create(metadata["model_type"])
-            model.load(model_bytes)
+        # Create empty model and load data outside the lock
+        model = ModelFactory.create(metadata["model_type"])
+        with model_file:
+            if file_stat.st_size < _MMAP_MIN_BYTES:
+                model.load(model_file.read())
+            else:
+                with mmap.mmap(model_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    if hasattr(mmap, "MADV_SEQUENTIAL"):
+                        mapped.madvise(mmap.MADV_SEQUENTIAL)
+                    model.load(mapped)
+        self._loaded_models.set(self._loaded_model_key(series_id, version, file_stat), model)
+
+        logger.debug(
+            "Loaded model: series_id='%s', version='%s', type='%s' from %s",
+            series_id, version, metadata["model_type"], model_path
+        )
 
         return model, version
 
+    @staticmethod
+    def _loaded_model_key(series_id: str, version: str, file_stat: os.stat_result) -> tuple:
+        return (series_id, version, file_stat.st_ino, file_stat.st_mtime_ns, file_stat.st_size)
+
+    @staticmethod
+    def _read_metadata(model_file, metadata_path: Path) -> bytes:
+        """Reads metadata from the open model file's xattr, else from its .meta.json."""
+        if hasattr(os, "getxattr"):
+            try:
+                return os.getxattr(model_file.fileno(), _METADATA_XATTR)
+            except OSError:
+                pass  # saved without xattr support
+
+        with open(metadata_path, 'rb') as f:
+            return f.read()
+
     def get_latest_version(self, series_id: str) -> Optional[str]:
-        versions = self.list_versions(series_id)
-        return versions[-1] if versions else None
+        with self._get_series_lock(series_id).read():
+            return self._latest_version(series_id)
 
     def _list_versions(self, series_id: str) -> List[str]:
         series_dir = self._get_series_dir(series_id)
 
-        if not series_dir.exists():
+        try:
+            dir_mtime = series_dir.stat().st_mtime_ns
+        except FileNotFoundError:
             return []
 
-        versions = []
+        cached = self._versions_cache.get(series_id)
+        if cached is not None and cached[0] == dir_mtime:
+            return list(cached[1])
 
-        # Look for .bin files (models)
-        for file_path in series_dir.glob("*.bin"):
-            name = file_path.stem
-            if not name:
-                continue
+        version_numbers = []
 
-            if name.startswith("v") and name[1:].isdigit():
-                versions.append(name)
+        # Look for v<N>.bin files (models); scandir yields names without a stat per entry
+        with os.scandir(series_dir) as entries:
+            for entry in entries:
+                number = _model_version_number(entry)
+                if number is not None:
+                    version_numbers.append(number)
 
-        return sorted(versions, key=lambda v: int(v.lstrip('v')))
+        version_numbers.sort()
+        versions = [f"v{number}" for number in version_numbers]
+        self._versions_cache.set(series_id, (dir_mtime, versions))
+        return list(versions)
 
     def list_versions(self, series_id: str) -> List[str]:
-        lock_path = self._get_lock_path(series_id)
-        lock = FileLock(lock_path, timeout=10)
-
-        with lock:
+        with self._get_series_lock(series_id).read():
             return self._list_versions(series_id)
 
     def list_all_series(self) -> List[str]:
-        if not self.storage_path.exists():
+        cached = self._series_list_cache
+        if cached is not None and self._dirs_unchanged(cached[1]):
+            return list(cached[0])
+
+        # Shard and model-less series directories can change without touching the root
+        dir_mtimes: dict[str, int] = {}
+        series_ids: List[str] = []
+        try:
+            dir_mtimes[str(self.storage_path)] = self.storage_path.stat().st_mtime_ns
+            shard_entries = list(os.scandir(self.storage_path))
+        except FileNotFoundError:
             return []
 
-        series_dirs: List[str] = []
-        for entry in self.storage_path.iterdir():
-            if entry.name == ".locks":
+        for shard in shard_entries:
+            if shard.name == ".locks" or not shard.is_dir():
                 continue
 
-            if not entry.is_dir():
-                continue
+            dir_mtimes[shard.path] = shard.stat().st_mtime_ns
+            for entry in os.scandir(shard.path):
+                if not entry.is_dir():
+                    continue
 
-            if any(entry.glob("*.bin")):
-                series_dirs.append(entry.name)
+                dir_mtime = entry.stat().st_mtime_ns
+                if self._has_models(entry.path):
+                    series_ids.append(entry.name)
+                else:
+                    dir_mtimes[entry.path] = dir_mtime
 
-        return series_dirs
+        self._series_list_cache = (series_ids, dir_mtimes)
+        return list(series_ids)
 
-    def model_exists(self, series_id: str, version: Optional[str] = None) -> bool:
+    @staticmethod
+    def _dirs_unchanged(dir_mtimes: dict[str, int]) -> bool:
         try:
-            lock_path = self._get_lock_path(series_id)
-            lock = FileLock(lock_path, timeout=10)
-
-            with lock:
-                if version is None:
-                    versions = self._list_versions(series_id)
-                    version = versions[-1] if versions else None
-                    if version is None:
-                        return False
+            return all(os.stat(path).st_mtime_ns == mtime for path, mtime in dir_mtimes.items())
+        except FileNotFoundError:
+            return False
 
-                model_path = self._get_model_path(series_id, version)
-                return model_path.exists()
+    def model_exists(self, series_id: str, version: Optional[str] = None) -> bool:
+        try:
+            with self._get_series_lock(series_id).read():
+                resolved = version
+                if resolved is None:
+                    resolved = self._latest_version(series_id)
+                return resolved is not None and self._get_model_path(series_id, resolved).exists()
         except (OSError, IOError, ValueError):
             return False
@@ -13,7 +13,17 @@ class S3ModelStorage(BaseModelStorage):
     def __init__(self, bucket_name: str, prefix: str = "models"):
         self.bucket_name = bucket_name
         self.prefix = prefix
-        # Mock: self.s3_client = boto3.client('s3')
+        # Mock: one pooled client per storage, reusing TLS connections across calls
+        # Mock: self.s3_client = boto3.session.Session().client('s3', config=Config(
+        #     max_pool_connections=64,
+        #     tcp_keepalive=True,
+        #     retries={"max_attempts": 3, "mode": "adaptive"},
+        #     signature_version='s3v4'
+        # ))
+        # Mock: large models go up as parallel 8 MB multipart chunks
+        # Mock: self.transfer_config = TransferConfig(
+        #     multipart_threshold=8 * MB, multipart_chunksize=8 * MB, max_concurrency=8
+        # )
 
     def save_model(self, series_id: str, model: BaseAnomalyModel,
                    version: Optional[str] = None) -> str:
@@ -24,11 +34,13 @@ class S3ModelStorage(BaseModelStorage):
         if version is None:
             version = self._generate_version(series_id)
 
-        # Mock: s3_key = f"{self.prefix}/{series_id}/{version}.json"
-        # Mock: self.s3_client.put_object(
-        #     Bucket=self.bucket_name,
-        #     Key=s3_key,
-        #     Body=json.dumps(model.to_dict())
+        # Mock: s3_key = f"{self.prefix}/{series_id}/{version}.bin"
+        # Mock: self.s3_client.upload_fileobj(
+        #     BytesIO(model.save()),
+        #     self.bucket_name,
+        #     s3_key,
+        #     ExtraArgs={"Metadata": {"model_type": model.get_model_type()}},
+        #     Config=self.transfer_config
         # )
 
         logger.info("Mock: uploaded model to S3: %s/%s", series_id, version)
@@ -55,7 +67,7 @@ class S3ModelStorage(BaseModelStorage):
 
     def list_versions(self, series_id: str) -> List[str]:
         """Simulates listing versions in S3."""
-        # Mock: list_objects_v2 and parse keys
+        # Mock: paginate list_objects_v2(Prefix=f"{self.prefix}/{series_id}/") and parse keys
         return []
 
     def list_all_series(self) -> List[str]:
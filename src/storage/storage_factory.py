@@ -1,6 +1,7 @@
 """
 Factory to create different storage backends.
 """
+import threading
 from src.storage.base_storage import BaseModelStorage
 from src.storage.filesystem_storage import FilesystemModelStorage
 from src.storage.s3_storage import S3ModelStorage
@@ -9,9 +10,23 @@ from src.storage.s3_storage import S3ModelStorage
 class StorageFactory:  # pylint: disable=too-few-public-methods
     """Creates storage based on configuration."""
 
+    # One storage per (type, kwargs); its caches and locks are shared by every caller
+    _instances: dict[tuple, BaseModelStorage] = {}
+    _lock = threading.Lock()
+
     @classmethod
     def create(cls, storage_type: str, **kwargs) -> BaseModelStorage:
-        """Instantiates storage by type."""
+        """Instantiates storage by type, reusing the instance built for the same config."""
+        key = (storage_type, tuple(sorted(kwargs.items())))
+        with cls._lock:
+            storage = cls._instances.get(key)
+            if storage is None:
+                storage = cls._build(storage_type, **kwargs)
+                cls._instances[key] = storage
+        return storage
+
+    @staticmethod
+    def _build(storage_type: str, **kwargs) -> BaseModelStorage:
         if storage_type == "filesystem":
             return FilesystemModelStorage(**kwargs)
         if storage_type == "s3":
@@ -1,17 +1,31 @@
+import asyncio
+import json
+import threading
 import unittest
-from unittest.mock import MagicMock
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, Mock
+import httpx
 from src.services.anomaly_service import AnomalyDetectionService
-from src.models.schemas import TrainData, DataPoint, TrainResponse
+from src.services.batcher import PredictionBatcher
+from src.services.local_training_service import LocalTrainingService
+from src.services.external_training_service import ExternalTrainingService
+from src.services.base_training_service import BaseTrainingService
+from src.storage.base_storage import BaseModelStorage
+from src.utils.base_metrics import BaseMetricsExporter
+from src.models.schemas import (
+    TrainData, DataPoint, TrainResponse, PredictBatchItem, PredictSeriesBatchResponse
+)
 from src.anomaly_models.statistical_model import StatisticalAnomalyModel
+from src.utils.ttl_cache import TTLCache
 
 
 class TestAnomalyDetectionService(unittest.TestCase):
 
     def setUp(self):
         """Set up mocks for ModelStorage, MetricsExporter, and TrainingService."""
-        self.mock_model_storage = MagicMock()
-        self.mock_metrics_exporter = MagicMock()
-        self.mock_training_service = MagicMock()
+        self.mock_model_storage = Mock(spec=BaseModelStorage)
+        self.mock_metrics_exporter = Mock(spec=BaseMetricsExporter)
+        self.mock_training_service = Mock(spec=BaseTrainingService)
         self.service = AnomalyDetectionService(
             model_storage=self.mock_model_storage,
             metrics_exporter=self.mock_metrics_exporter,
@@ -79,6 +93,91 @@ class TestAnomalyDetectionService(unittest.TestCase):
         self.assertFalse(response.anomaly)
         self.assertEqual(response.model_version, version)
 
+    def test_predict_series_batch(self):
+        """Tests batched prediction loads the model once and scores every value."""
+        series_id = "test-series"
+        values = [1.1, 10.0, 0.9]
+
+        mock_model = StatisticalAnomalyModel()
+        mock_model.mean = 1.0
+        mock_model.std = 0.5
+
+        self.mock_model_storage.load_model.return_value = (mock_model, "v1")
+
+        response = self.service.predict_series_batch(series_id, values)
+
+        self.mock_model_storage.load_model.assert_called_once_with(series_id, None)
+        self.assertEqual(response.anomalies, [False, True, False])
+        self.assertEqual(response.model_version, "v1")
+
+    def test_predict_anomaly_batch_across_series(self):
+        """Tests cross-series batches score each item against its own series' model."""
+        low_model = StatisticalAnomalyModel()
+        low_model.mean = 1.0
+        low_model.std = 0.5
+        high_model = StatisticalAnomalyModel()
+        high_model.mean = 100.0
+        high_model.std = 5.0
+
+        self.mock_model_storage.load_model.side_effect = lambda series_id, version: {
+            "low": (low_model, "v1"), "high": (high_model, "v2")
+        }[series_id]
+
+        items = [
+            PredictBatchItem(series_id="low", timestamp=1, value=10.0),
+            PredictBatchItem(series_id="high", timestamp=1, value=10.0),
+            PredictBatchItem(series_id="low", timestamp=2, value=1.0),
+            PredictBatchItem(series_id="high", timestamp=2, value=200.0),
+        ]
+        response = self.service.predict_anomaly_batch(items)
+
+        self.assertEqual(self.mock_model_storage.load_model.call_count, 2)
+        self.assertEqual(response.anomalies, [True, False, False, True])
+        self.assertEqual(response.model_versions, ["v1", "v2", "v1", "v2"])
+
+    def test_predict_anomaly_cached_until_retrain(self):
+        """Tests repeated predictions hit the cache and a retrain invalidates it."""
+        self.service.prediction_cache = TTLCache(max_entries=10, ttl_seconds=60)
+        model = StatisticalAnomalyModel()
+        model.mean = 1.0
+        model.std = 0.5
+        self.mock_model_storage.load_model.return_value = (model, "v1")
+        data_point = DataPoint(timestamp=1, value=1.1)
+
+        first = self.service.predict_anomaly("test-series", data_point)
+        second = self.service.predict_anomaly("test-series", data_point)
+
+        self.assertIs(first, second)
+        self.mock_model_storage.load_model.assert_called_once()
+        self.mock_metrics_exporter.record_inference_latency_ns.assert_called_once()
+
+        self.service.train_model("test-series", MagicMock())
+        self.service.predict_anomaly("test-series", data_point)
+
+        self.assertEqual(self.mock_model_storage.load_model.call_count, 2)
+
+    def test_predict_anomaly_reuses_cached_model(self):
+        """Tests a loaded model is reused until the latest version changes."""
+        self.service.model_cache = TTLCache(max_entries=10, ttl_seconds=None)
+        model = StatisticalAnomalyModel()
+        model.mean = 1.0
+        model.std = 0.5
+        self.mock_model_storage.get_latest_version.return_value = "v1"
+        self.mock_model_storage.load_model.return_value = (model, "v1")
+
+        self.service.predict_anomaly("test-series", DataPoint(timestamp=1, value=1.1))
+        response = self.service.predict_anomaly("test-series", DataPoint(timestamp=2, value=9.0))
+
+        self.assertTrue(response.anomaly)
+        self.mock_model_storage.load_model.assert_called_once_with("test-series", "v1")
+
+        self.mock_model_storage.get_latest_version.return_value = "v2"
+        self.mock_model_storage.load_model.return_value = (model, "v2")
+        response = self.service.predict_anomaly("test-series", DataPoint(timestamp=3, value=1.1))
+
+        self.assertEqual(response.model_version, "v2")
+        self.assertEqual(self.mock_model_storage.load_model.call_count, 2)
+
     def test_get_trained_series_count(self):
         """Tests the count of trained series."""
         self.mock_model_storage.list_all_series.return_value = ["series-1", "series-2"]
@@ -88,6 +187,101 @@ class TestAnomalyDetectionService(unittest.TestCase):
         self.assertEqual(count, 2)
         self.mock_model_storage.list_all_series.assert_called_once()
 
+    def test_get_trained_series_count_reused_until_training(self):
+        """Tests the series count is reused between calls and refreshed after training."""
+        self.mock_model_storage.list_all_series.return_value = ["series-1"]
+
+        self.service.get_trained_series_count()
+        self.service.get_trained_series_count()
+        self.mock_model_storage.list_all_series.assert_called_once()
+
+        self.mock_model_storage.list_all_series.return_value = ["series-1", "series-2"]
+        self.service.train_model("series-2", MagicMock())
+
+        self.assertEqual(self.service.get_trained_series_count(), 2)
+
+
+class TestPredictionBatcher(unittest.TestCase):
+
+    def test_concurrent_submissions_share_one_batch_call(self):
+        """Tests concurrent points for one series are scored in a single batched call."""
+        mock_service = Mock(spec=AnomalyDetectionService)
+        mock_service.predict_series_batch.return_value = PredictSeriesBatchResponse(
+            anomalies=[False, True, False], model_version="v1"
+        )
+        batcher = PredictionBatcher(mock_service, max_batch_size=3, max_latency_ms=50)
+
+        async def submit_all():
+            return await asyncio.gather(*(
+                batcher.submit("test-series", None, value) for value in (1.0, 9.0, 1.1)
+            ))
+
+        responses = asyncio.run(submit_all())
+
+        mock_service.predict_series_batch.assert_called_once_with(
+            "test-series", [1.0, 9.0, 1.1], None
+        )
+        self.assertEqual([r.anomaly for r in responses], [False, True, False])
+        self.assertEqual({r.model_version for r in responses}, {"v1"})
+
+
+class TestLocalTrainingService(unittest.TestCase):
+
+    def test_concurrent_identical_trainings_share_one_run(self):
+        """Tests identical concurrent requests for a series fit and save once."""
+        saving = threading.Event()
+        coalesced = threading.Event()
+        release = threading.Event()
+
+        def save_model(series_id, model):  # pylint: disable=unused-argument
+            saving.set()
+            release.wait(5)
+            return "v1"
+
+        mock_storage = Mock(spec=BaseModelStorage)
+        mock_storage.save_model.side_effect = save_model
+        mock_metrics = Mock(spec=BaseMetricsExporter)
+        mock_metrics.record_coalesced_training.side_effect = coalesced.set
+        service = LocalTrainingService(mock_storage, mock_metrics)
+        train_data = TrainData(timestamps=[1, 2, 3], values=[1.0, 2.0, 4.0])
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            first = executor.submit(service.train, "test-series", train_data)
+            self.assertTrue(saving.wait(timeout=5))
+            second = executor.submit(service.train, "test-series", train_data)
+            self.assertTrue(coalesced.wait(timeout=5))
+            release.set()
+
+        self.assertIs(first.result(), second.result())
+        mock_storage.save_model.assert_called_once()
+
+
+class TestExternalTrainingService(unittest.TestCase):
+
+    def test_train_batch_posts_each_series_with_its_timestamps(self):
+        """Tests batch fits send every series' own timestamps and keep input order."""
+        sent = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            sent[body["series_id"]] = body["timestamps"]
+            return httpx.Response(200, json={"series_id": body["series_id"], "version": "v1"})
+
+        service = ExternalTrainingService("http://training.invalid", Mock(spec=BaseMetricsExporter))
+        self.addCleanup(service.close)
+        service._client = httpx.Client(  # pylint: disable=protected-access
+            transport=httpx.MockTransport(handler)
+        )
+
+        results = service.train_batch({
+            "series-a": TrainData(timestamps=[10, 20, 30], values=[1.0, 2.0, 4.0]),
+            "series-b": TrainData(timestamps=[5, 6, 7, 8], values=[1.0, 3.0, 2.0, 5.0]),
+        })
+
+        self.assertEqual(sent, {"series-a": [10, 20, 30], "series-b": [5, 6, 7, 8]})
+        self.assertEqual([r.series_id for r in results], ["series-a", "series-b"])
+        self.assertEqual([r.points_used for r in results], [3, 4])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import numpy as np
+from src.utils.memory_metrics import MemoryMetricsExporter, _LatencyWindow
+
+
+class TestLatencyWindow(unittest.TestCase):
+
+    def assertWindow(self, window, expected):  # pylint: disable=invalid-name
+        """Checks the window's running mean and samples match the expected last samples."""
+        avg, samples = window.snapshot()
+        self.assertAlmostEqual(avg, float(np.mean(expected)))
+        self.assertEqual(sorted(samples.tolist()), sorted(expected))
+
+    def test_extend_partial_fill(self):
+        """Tests a batch smaller than the free space is appended after existing samples."""
+        window = _LatencyWindow(5)
+        window.append(10)
+        window.extend(np.array([20, 30]))
+
+        self.assertWindow(window, [10, 20, 30])
+
+    def test_extend_wraps_ring(self):
+        """Tests a batch crossing the end of the buffer evicts the oldest samples."""
+        window = _LatencyWindow(4)
+        window.extend(np.array([1, 2, 3]))
+        window.extend(np.array([4, 5, 6]))
+
+        self.assertWindow(window, [3, 4, 5, 6])
+
+        window.append(7)
+        self.assertWindow(window, [4, 5, 6, 7])
+
+    def test_extend_larger_than_window(self):
+        """Tests a batch bigger than the window keeps only its newest samples."""
+        window = _LatencyWindow(3)
+        window.append(100)
+        window.extend(np.arange(1, 11))
+
+        self.assertWindow(window, [8, 9, 10])
+
+    def test_extend_empty_batch(self):
+        """Tests an empty batch leaves the window, and its generation, untouched."""
+        window = _LatencyWindow(3)
+        self.assertEqual(window.snapshot()[0], None)
+
+        window.extend(np.array([], dtype=np.int64))
+        self.assertEqual(window.snapshot()[0], None)
+
+        window.append(5)
+        generation = window.generation
+        window.extend([])
+        self.assertWindow(window, [5])
+        self.assertEqual(window.generation, generation)
+
+
+class TestMemoryMetricsExporter(unittest.TestCase):
+
+    def test_batch_and_single_recording_agree(self):
+        """Tests batch-recorded latencies summarize the same as one-by-one recording."""
+        latencies_ms = [1.5, 2.25, 3.0, 4.0, 10.0]
+        single = MemoryMetricsExporter(max_samples=4)
+        for latency_ms in latencies_ms:
+            single.record_inference_latency(latency_ms)
+        batched = MemoryMetricsExporter(max_samples=4)
+        batched.record_inference_latencies(np.array(latencies_ms))
+
+        self.assertEqual(batched.get_inference_metrics(), single.get_inference_metrics())
+        self.assertAlmostEqual(batched.get_inference_metrics().avg, 4.8125)
+        self.assertAlmostEqual(
+            batched.get_inference_metrics().p95, float(np.percentile(latencies_ms[1:], 95))
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
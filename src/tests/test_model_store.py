@@ -2,10 +2,14 @@ import unittest
 import tempfile
 import shutil
 import json
+import struct
+import threading
 from pathlib import Path
+from unittest.mock import patch
 from src.storage.filesystem_storage import FilesystemModelStorage
 from src.anomaly_models.statistical_model import StatisticalAnomalyModel
 from src.models.schemas import TrainData
+from src.utils.rw_lock import ReadersWriterLock
 
 
 class TestFilesystemModelStorage(unittest.TestCase):
@@ -37,21 +41,82 @@ class TestFilesystemModelStorage(unittest.TestCase):
         version = self.model_store.save_model(series_id, model)
         self.assertEqual(version, "v0")
 
-        model_path = Path(self.test_dir) / series_id / "v0.json"
         model_path = self.model_store._get_model_path(series_id, version) # pylint: disable=W0212
+        metadata_path = self.model_store._get_metadata_path(  # pylint: disable=W0212
+            series_id, version
+        )
+
+        shard = self.model_store._get_shard(series_id)  # pylint: disable=W0212
+        self.assertEqual(model_path, Path(self.test_dir) / shard / series_id / "v0.bin")
+
+        with open(model_path, 'rb') as f:
+            _, threshold, mean, std = struct.unpack("<Bddd", f.read())
+            self.assertEqual(threshold, model.threshold)
+            self.assertEqual(mean, model.mean)
+            self.assertEqual(std, model.std)
+
+            # Metadata lives in an xattr on the model file, or in .meta.json without support
+            metadata = json.loads(
+                self.model_store._read_metadata(f, metadata_path)  # pylint: disable=W0212
+            )
+            self.assertEqual(metadata["series_id"], series_id)
+            self.assertEqual(metadata["version"], "v0")
+            self.assertEqual(metadata["model_type"], "statistical")
 
-        with open(model_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+    def test_metadata_file_fallback_without_xattr(self):
+        """Tests models saved where xattrs are unsupported keep a .meta.json and still load."""
+        series_id = "series-no-xattr"
+        model = self._create_fitted_mock_model()
+        with patch.object(FilesystemModelStorage, "_set_metadata_xattr", return_value=False):
+            version = self.model_store.save_model(series_id, model)
+
+        metadata_path = self.model_store._get_metadata_path(  # pylint: disable=W0212
+            series_id, version
+        )
+        self.assertTrue(metadata_path.exists())
+        loaded_model, _ = self.model_store.load_model(series_id, version)
+        self.assertEqual(loaded_model.mean, model.mean)
+
+    def test_metadata_xattr_flushed_when_fsync_enabled(self):
+        """Tests the staged model is fsynced again after its metadata xattr is set."""
+        store = FilesystemModelStorage(storage_path=self.test_dir, fsync=True)
+        events = []
+
+        def set_xattr(path, metadata):  # pylint: disable=unused-argument
+            events.append(("setxattr", str(path)))
+            return True
+
+        with patch.object(FilesystemModelStorage, "_set_metadata_xattr", side_effect=set_xattr), \
+                patch.object(FilesystemModelStorage, "_fsync_path",
+                             side_effect=lambda path: events.append(("fsync", str(path)))):
+            store.save_model("series-durable", self._create_fitted_mock_model())
+
+        _, staged_path = events[0]
+        self.assertEqual(events[1], ("fsync", staged_path))
+
+    def test_load_legacy_json_model(self):
+        """Tests that models persisted as JSON can still be loaded."""
+        model = StatisticalAnomalyModel().load(
+            b'{"model_type": "statistical", "threshold": 3.0, "mean": 1.0, "std": 0.5}'
+        )
+        self.assertEqual(model.mean, 1.0)
+        self.assertEqual(model.std, 0.5)
+        self.assertEqual((model.lower_bound, model.upper_bound), (-0.5, 2.5))
+        self.assertTrue(model.is_fitted())
 
-            self.assertEqual(model_path, Path(self.test_dir) / series_id / "v0.bin")
+    def test_load_invalid_binary_leaves_model_untouched(self):
+        """Tests truncated blobs and unknown tags raise ValueError before any field is set."""
+        model = self._create_fitted_mock_model()
+        blob = model.save()
+        target = StatisticalAnomalyModel()
 
-            # self.assertEqual(data["series_id"], series_id)
-            # self.assertEqual(data["version"], "v0")
-            self.assertIn("model_type", data)
-            self.assertIn("threshold", data)
-            self.assertIn("std", data)
-            self.assertIn("mean", data)
+        with self.assertRaises(ValueError):
+            target.load(blob[:-1])
+        with self.assertRaises(ValueError):
+            target.load(b"\x02" + blob[1:])
 
+        self.assertFalse(target.is_fitted())
+        self.assertIsNone(target.mean)
 
     def test_save_unfitted_model_raises_error(self):
         """Tests that saving an unfitted model raises a ValueError."""
@@ -71,6 +136,31 @@ class TestFilesystemModelStorage(unittest.TestCase):
         self.assertTrue(loaded_model._is_fitted)  # noqa: SLF001 pylint: disable=protected-access
         self.assertEqual(loaded_version, version)
 
+    def test_load_model_memory_mapped(self):
+        """Tests model files above the mmap threshold load through a read-only mapping."""
+        series_id = "series-mmap"
+        model = self._create_fitted_mock_model()
+        version = self.model_store.save_model(series_id, model)
+
+        with patch("src.storage.filesystem_storage._MMAP_MIN_BYTES", 0):
+            loaded_model, _ = self.model_store.load_model(series_id, version)
+
+        self.assertEqual((loaded_model.mean, loaded_model.std), (model.mean, model.std))
+
+    def test_load_model_reuses_parsed_model_until_file_changes(self):
+        """Tests repeated loads return the cached model and a re-save is parsed again."""
+        series_id = "series-cached"
+        model = self._create_fitted_mock_model()
+        version = self.model_store.save_model(series_id, model)
+
+        first, _ = self.model_store.load_model(series_id, version)
+        second, _ = self.model_store.load_model(series_id, version)
+        self.assertIs(first, second)
+
+        self.model_store.save_model(series_id, model, version=version)
+        third, _ = self.model_store.load_model(series_id, version)
+        self.assertIsNot(first, third)
+
     def test_load_nonexistent_model_raises_error(self):
         """Tests that loading a non-existent model raises FileNotFoundError."""
         with self.assertRaises(FileNotFoundError):
@@ -93,6 +183,21 @@ class TestFilesystemModelStorage(unittest.TestCase):
         latest_version = self.model_store.get_latest_version(series_id)
         self.assertEqual(latest_version, "v1")
 
+    def test_version_index_rebuilt_when_missing(self):
+        """Tests the packed version index is kept in sync and rebuilt from a directory scan."""
+        series_id = "series-index"
+        model = self._create_fitted_mock_model()
+        self.model_store.save_model(series_id, model)
+        self.model_store.save_model(series_id, model)
+
+        index_path = self.model_store._get_index_path(series_id)  # pylint: disable=W0212
+        self.assertEqual(struct.unpack("<QQ", index_path.read_bytes()), (2, 1))
+
+        index_path.unlink()
+        self.assertEqual(self.model_store.get_latest_version(series_id), "v1")
+        self.assertEqual(self.model_store.save_model(series_id, model), "v2")
+        self.assertEqual(struct.unpack("<QQ", index_path.read_bytes()), (3, 2))
+
     def test_load_latest_model(self):
         """Tests loading the most recent version of a model."""
         series_id = "series-4"
@@ -106,6 +211,21 @@ class TestFilesystemModelStorage(unittest.TestCase):
         self.assertEqual(loaded_version, "v1")
         self.assertTrue(loaded_model._is_fitted)  # noqa: SLF001 pylint: disable=protected-access
 
+    def test_flat_layout_migrated_into_shards(self):
+        """Tests series stored directly under the root are moved into shards on startup."""
+        model = self._create_fitted_mock_model()
+        version = self.model_store.save_model("series-flat", model)
+        series_dir = self.model_store._get_series_dir("series-flat")  # pylint: disable=W0212
+        shutil.move(series_dir, Path(self.test_dir) / "series-flat")
+        (Path(self.test_dir) / ".sharded").unlink()
+
+        store = FilesystemModelStorage(storage_path=self.test_dir)
+
+        self.assertFalse((Path(self.test_dir) / "series-flat").exists())
+        self.assertEqual(store.list_all_series(), ["series-flat"])
+        _, loaded_version = store.load_model("series-flat")
+        self.assertEqual(loaded_version, version)
+
     def test_list_all_series(self):
         """Tests listing all series with saved models."""
         model = self._create_fitted_mock_model()
@@ -118,3 +238,56 @@ class TestFilesystemModelStorage(unittest.TestCase):
         self.assertIn("series-a", all_series)
         self.assertIn("series-b", all_series)
         self.assertEqual(len(all_series), 2)
+
+    def test_series_with_only_an_index_is_not_listed(self):
+        """Tests index.bin or a stray *.bin directory does not make a series count as trained."""
+        series_dir = self.model_store._get_series_dir("series-empty")  # pylint: disable=W0212
+        (series_dir / "index.bin").write_bytes(struct.pack("<QQ", 0, 0))
+        (series_dir / "v0.bin").mkdir()
+
+        self.assertEqual(self.model_store.list_all_series(), [])
+        self.assertEqual(self.model_store.list_versions("series-empty"), [])
+
+    def test_listing_cache_and_model_exists_refresh_after_save(self):
+        """Tests cached listings and model_exists see a model as soon as it is saved."""
+        model = self._create_fitted_mock_model()
+        self.model_store.save_model("series-a", model)
+        self.assertEqual(self.model_store.list_all_series(), ["series-a"])
+        self.assertFalse(self.model_store.model_exists("series-b"))
+
+        self.model_store.save_model("series-b", model)
+
+        self.assertEqual(sorted(self.model_store.list_all_series()), ["series-a", "series-b"])
+        self.assertTrue(self.model_store.model_exists("series-b"))
+        self.assertEqual(self.model_store.list_versions("series-b"), ["v0"])
+
+    def test_model_exists_sees_saves_from_another_instance(self):
+        """Tests a miss is not remembered, so a model saved by another worker is found at once."""
+        other_store = FilesystemModelStorage(storage_path=self.test_dir)
+        self.assertFalse(self.model_store.model_exists("series-other"))
+
+        other_store.save_model("series-other", self._create_fitted_mock_model())
+
+        self.assertTrue(self.model_store.model_exists("series-other"))
+
+
+class TestReadersWriterLock(unittest.TestCase):
+
+    def test_readers_share_and_writer_waits(self):
+        """Tests readers hold the lock together while a writer waits for them to leave."""
+        rw_lock = ReadersWriterLock()
+        events = []
+
+        def write():
+            with rw_lock.write():
+                events.append("write")
+
+        with rw_lock.read():
+            with rw_lock.read():
+                writer = threading.Thread(target=write)
+                writer.start()
+                writer.join(0.1)
+                events.append("read")
+
+        writer.join(5)
+        self.assertEqual(events, ["read", "write"])
@@ -1,12 +1,30 @@
 """
 Integration tests for API routes.
+
+One TestClient is shared by the module, and tests that only need some trained model
+use the module-scoped trained_sensor fixture instead of each fitting their own.
 """
+import pytest
 from fastapi.testclient import TestClient
 from src.main import app
 
 client = TestClient(app)
 
 
+@pytest.fixture(scope="module")
+def trained_sensor() -> str:
+    """Trains one shared series for tests that only read from a trained model."""
+    response = client.post(
+        "/fit/sensor_shared_test",
+        json={
+            "timestamps": [1, 2, 3, 4, 5],
+            "values": [10.0, 10.5, 10.2, 10.3, 10.1]
+        }
+    )
+    assert response.status_code == 200
+    return "sensor_shared_test"
+
+
 class TestTrainingEndpoint:
     """Tests for /fit/{series_id} endpoint."""
 
@@ -61,6 +79,18 @@ class TestTrainingEndpoint:
         assert response.status_code == 400
         assert "invalid" in response.text.lower() or "characters" in response.text.lower()
 
+    def test_train_model_path_traversal_series_id(self):
+        """Test that '..' in series_id is rejected by the path constraint with a 400."""
+        response = client.post(
+            "/fit/sensor..invalid",
+            json={
+                "timestamps": [1609459200, 1609545600, 1609632000],
+                "values": [23.5, 24.1, 23.8]
+            }
+        )
+        assert response.status_code == 400
+        assert "path traversal" in response.text.lower()
+
     def test_train_model_unordered_timestamps(self):
         """Test training with unordered timestamps."""
         response = client.post(
@@ -74,6 +104,76 @@ class TestTrainingEndpoint:
         assert "ascending order" in response.text.lower()
 
 
+class TestBackgroundTrainingEndpoint:
+    """Tests for /fit?background=true and /jobs/{job_id}."""
+
+    def test_background_fit_returns_pollable_job(self):
+        """Test background training is accepted and its job reports the result."""
+        response = client.post(
+            "/fit/sensor_background_test?background=true",
+            json={
+                "timestamps": [1, 2, 3, 4, 5],
+                "values": [10.0, 10.5, 10.2, 10.3, 10.1]
+            }
+        )
+        assert response.status_code == 202
+        job = response.json()
+        assert job["status"] == "pending"
+
+        # TestClient runs background tasks before returning the response
+        job_response = client.get(f"/jobs/{job['job_id']}")
+        assert job_response.status_code == 200
+        data = job_response.json()
+        assert data["status"] == "done"
+        assert data["result"]["series_id"] == "sensor_background_test"
+        assert data["result"]["points_used"] == 5
+
+    def test_unknown_job(self):
+        """Test polling a job that does not exist."""
+        response = client.get("/jobs/does-not-exist")
+        assert response.status_code == 404
+
+
+class TestFitBatchEndpoint:
+    """Tests for /fit_batch endpoint."""
+
+    def test_fit_batch_success(self):
+        """Test training several series in one request."""
+        response = client.post(
+            "/fit_batch",
+            json={
+                "series": {
+                    "sensor_fit_batch_a": {
+                        "timestamps": [1, 2, 3, 4, 5],
+                        "values": [10.0, 10.5, 10.2, 10.3, 10.1]
+                    },
+                    "sensor_fit_batch_b": {"timestamps": [1, 2, 3], "values": [1.0, 2.0, 3.0]}
+                }
+            }
+        )
+        assert response.status_code == 200
+        models = response.json()["models"]
+        assert [m["series_id"] for m in models] == ["sensor_fit_batch_a", "sensor_fit_batch_b"]
+        assert [m["points_used"] for m in models] == [5, 3]
+
+        predict_response = client.post(
+            "/predict/sensor_fit_batch_a",
+            json={"timestamp": "6", "value": 100.0}
+        )
+        assert predict_response.status_code == 200
+        assert predict_response.json()["anomaly"] is True
+
+    def test_fit_batch_invalid_values(self):
+        """Test that any invalid series rejects the whole batch."""
+        response = client.post(
+            "/fit_batch",
+            json={"series": {
+                "sensor_fit_batch_c": {"timestamps": [1, 2, 3], "values": [5.0, 5.0, 5.0]}
+            }}
+        )
+        assert response.status_code == 422
+
+
 class TestPredictionEndpoint:
     """Tests for /predict/{series_id} endpoint."""
 
@@ -89,21 +189,19 @@ class TestPredictionEndpoint:
         assert response.status_code == 404
         assert ("not found" in response.text.lower() or "no model found" in response.text.lower())
 
-    def test_predict_after_training(self):
-        """Test prediction after training a model."""
-        # First train a model
-        train_response = client.post(
-            "/fit/sensor_predict_test",
-            json={
-                "timestamps": [1, 2, 3, 4, 5],
-                "values": [10.0, 10.5, 10.2, 10.3, 10.1]
-            }
+    def test_predict_non_numeric_timestamp(self):
+        """Test that a non-numeric timestamp is rejected at parse time."""
+        response = client.post(
+            "/predict/nonexistent_series",
+            json={"timestamp": "yesterday", "value": 50.0}
         )
-        assert train_response.status_code == 200
+        assert response.status_code == 422
 
-        # Then make a prediction (normal value)
+    def test_predict_after_training(self, trained_sensor):
+        """Test prediction after training a model."""
+        # Make a prediction (normal value)
         predict_response = client.post(
-            "/predict/sensor_predict_test",
+            f"/predict/{trained_sensor}",
             json={
                 "timestamp": "6",
                 "value": 10.4
@@ -117,7 +215,7 @@ class TestPredictionEndpoint:
 
         # Test with anomalous value
         predict_anomaly_response = client.post(
-            "/predict/sensor_predict_test",
+            f"/predict/{trained_sensor}",
             json={
                 "timestamp": "7",
                 "value": 100.0  # Very different from training data
@@ -128,6 +226,54 @@ class TestPredictionEndpoint:
         assert data["anomaly"] is True
 
 
+class TestPredictBatchEndpoint:
+    """Tests for /predict_batch endpoint."""
+
+    def test_predict_batch_after_training(self, trained_sensor):
+        """Test batched prediction across a trained series."""
+        response = client.post(
+            "/predict_batch",
+            json={
+                "items": [
+                    {"series_id": trained_sensor, "timestamp": 6, "value": 10.4},
+                    {"series_id": trained_sensor, "timestamp": 7, "value": 100.0}
+                ]
+            }
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["anomalies"] == [False, True]
+        assert len(data["model_versions"]) == 2
+
+    def test_predict_series_batch_after_training(self):
+        """Test batched prediction scoped to a single series."""
+        train_response = client.post(
+            "/fit/sensor_series_batch_test",
+            json={
+                "timestamps": [1, 2, 3, 4, 5],
+                "values": [10.0, 10.5, 10.2, 10.3, 10.1]
+            }
+        )
+        assert train_response.status_code == 200
+
+        response = client.post(
+            "/predict_batch/sensor_series_batch_test",
+            json={"values": [10.4, 100.0, 10.1]}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["anomalies"] == [False, True, False]
+        assert data["model_version"] == train_response.json()["version"]
+
+    def test_predict_batch_model_not_found(self):
+        """Test batched prediction when a model doesn't exist."""
+        response = client.post(
+            "/predict_batch",
+            json={"items": [{"series_id": "nonexistent_batch", "timestamp": 1, "value": 1.0}]}
+        )
+        assert response.status_code == 404
+
+
 class TestHealthCheckEndpoint:  # pylint: disable=too-few-public-methods
     """Tests for /healthcheck endpoint."""
 
@@ -150,37 +296,47 @@ class TestVisualizationEndpoint:
         response = client.get("/plot/nonexistent_plot")
         assert response.status_code == 404
 
-    def test_plot_after_training(self):
+    def test_plot_after_training(self, trained_sensor):
         """Test plot generation after training a model."""
-        # First train a model
-        train_response = client.post(
-            "/fit/sensor_plot_test",
-            json={
-                "timestamps": [1, 2, 3, 4, 5],
-                "values": [10.0, 10.5, 10.2, 10.3, 10.1]
-            }
-        )
-        assert train_response.status_code == 200
-
-        # Generate plot
-        plot_response = client.get("/plot/sensor_plot_test")
+        plot_response = client.get(f"/plot/{trained_sensor}")
         assert plot_response.status_code == 200
         assert plot_response.headers["content-type"] == "image/png"
         assert len(plot_response.content) > 0
 
-    def test_plot_invalid_format(self):
-        """Test plot with invalid format parameter."""
-        # Train a model first
-        client.post(
-            "/fit/sensor_format_test",
-            json={
-                "timestamps": [1, 2, 3, 4, 5],
-                "values": [10.0, 10.5, 10.2, 10.3, 10.1]
-            }
+    def test_plot_svg(self, trained_sensor):
+        """Test SVG plots are served from the text template."""
+        plot_response = client.get(f"/plot/{trained_sensor}?format=svg")
+        assert plot_response.status_code == 200
+        assert plot_response.headers["content-type"] == "image/svg+xml"
+        assert plot_response.text.startswith("<svg")
+        assert f"Time Series: {trained_sensor}" in plot_response.text
+
+    def test_plot_not_modified(self, trained_sensor):
+        """Test plot revalidation with If-None-Match returns 304."""
+        plot_response = client.get(f"/plot/{trained_sensor}")
+        assert plot_response.status_code == 200
+        etag = plot_response.headers["etag"]
+
+        cached_response = client.get(
+            f"/plot/{trained_sensor}", headers={"If-None-Match": etag}
         )
+        assert cached_response.status_code == 304
+        assert cached_response.headers["etag"] == etag
+        assert cached_response.content == b""
 
-        # Request invalid format
-        response = client.get("/plot/sensor_format_test?format=invalid")
+    def test_plot_cache_control(self, trained_sensor):
+        """Test latest plots must be revalidated while pinned versions may be reused."""
+        latest_response = client.get(f"/plot/{trained_sensor}")
+        assert latest_response.headers["cache-control"] == "no-cache"
+
+        version = latest_response.headers["etag"].strip('"').split(":")[1]
+        pinned_response = client.get(f"/plot/{trained_sensor}?version={version}")
+        assert pinned_response.status_code == 200
+        assert pinned_response.headers["cache-control"] == "private, max-age=30"
+
+    def test_plot_invalid_format(self, trained_sensor):
+        """Test plot with invalid format parameter."""
+        response = client.get(f"/plot/{trained_sensor}?format=invalid")
         assert response.status_code == 422
 
 
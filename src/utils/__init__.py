@@ -1,12 +1,20 @@
 """
 Utilities package.
+
+Exports are resolved on first access, so importing a light submodule such as
+src.utils.ttl_cache does not pull in the metrics exporters and their schemas.
 """
+from importlib import import_module
 
-from src.utils.base_metrics import BaseMetricsExporter
-from src.utils.memory_metrics import MemoryMetricsExporter
+# Eager: logger shares its submodule's name, which a lazy lookup would return instead
 from src.utils.logger import logger
-from src.utils.prometheus_metrics import PrometheusMetricsExporter
-from src.utils.metrics_factory import MetricsFactory
+
+_EXPORTS = {
+    "BaseMetricsExporter": "src.utils.base_metrics",
+    "MemoryMetricsExporter": "src.utils.memory_metrics",
+    "PrometheusMetricsExporter": "src.utils.prometheus_metrics",
+    "MetricsFactory": "src.utils.metrics_factory",
+}
 
 __all__ = [
     "BaseMetricsExporter",
@@ -15,3 +23,12 @@ __all__ = [
     "MetricsFactory",
     "logger",
 ]
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
@@ -2,12 +2,15 @@
 Base interface for different metrics exporters.
 """
 from abc import ABC, abstractmethod
+from typing import Iterable
 from src.models.schemas import Metrics
 
 
 class BaseMetricsExporter(ABC):
     """Interface for exporting metrics in different ways."""
 
+    __slots__ = ()
+
     @abstractmethod
     def record_training_latency(self, latency_ms: float):
         """Records training latency."""
@@ -16,6 +19,33 @@ class BaseMetricsExporter(ABC):
     def record_inference_latency(self, latency_ms: float):
         """Records inference latency."""
 
+    def record_training_latency_ns(self, latency_ns: int):
+        """Records training latency from a perf_counter_ns delta."""
+        self.record_training_latency(latency_ns / 1_000_000)
+
+    def record_inference_latency_ns(self, latency_ns: int):
+        """Records inference latency from a perf_counter_ns delta."""
+        self.record_inference_latency(latency_ns / 1_000_000)
+
+    def record_training_latencies(self, latencies_ms: Iterable[float]):
+        """Records a batch of training latencies; defaults to one record call per sample."""
+        for latency_ms in latencies_ms:
+            self.record_training_latency(float(latency_ms))
+
+    def record_inference_latencies(self, latencies_ms: Iterable[float]):
+        """Records a batch of inference latencies; defaults to one record call per sample."""
+        for latency_ms in latencies_ms:
+            self.record_inference_latency(float(latency_ms))
+
+    def record_model_cache_access(self, hit: bool):
+        """Records a model cache hit or miss; exporters that don't track it ignore it."""
+
+    def record_inference_batch_size(self, size: int):
+        """Records how many points one batched prediction scored."""
+
+    def record_coalesced_training(self):
+        """Records a training request served by an identical one already in flight."""
+
     @abstractmethod
     def get_training_metrics(self) -> Metrics:
         """Returns aggregated training metrics."""
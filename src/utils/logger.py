@@ -6,8 +6,13 @@ Provides a centralized logging setup with configurable levels and formatting.
 import logging
 import sys
 import os
+import threading
+from collections import OrderedDict
 from typing import Optional
 
+# Number of distinct exception signatures whose tracebacks are remembered
+_TRACEBACK_CACHE_SIZE = 256
+
 
 def setup_logger(
     name: str = "anomaly_detection",
@@ -53,5 +58,36 @@ def setup_logger(
     return log_instance
 
 
+_seen_exceptions: "OrderedDict[tuple, None]" = OrderedDict()
+_seen_exceptions_lock = threading.Lock()
+
+
+def _is_new_exception(exc: BaseException) -> bool:
+    """Records exc's signature, returning True the first time it is seen."""
+    key = (type(exc).__qualname__, repr(exc.args))
+    with _seen_exceptions_lock:
+        if key in _seen_exceptions:
+            _seen_exceptions.move_to_end(key)
+            return False
+        _seen_exceptions[key] = None
+        if len(_seen_exceptions) > _TRACEBACK_CACHE_SIZE:
+            _seen_exceptions.popitem(last=False)
+        return True
+
+
+def log_exc_sampled(
+    log_instance: logging.Logger, exc: BaseException, msg: str, *args
+) -> None:
+    """
+    Log an error, attaching the traceback only for unseen exception signatures.
+
+    Formatting a traceback dominates the cost of an error log line, so repeats
+    of the same exception type and arguments are logged without it.
+    """
+    log_instance.error(
+        msg, *args, exc_info=exc if _is_new_exception(exc) else None, stacklevel=2
+    )
+
+
 # Create default logger instance
 logger = setup_logger()
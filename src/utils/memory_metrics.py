@@ -1,69 +1,214 @@
 """
 Métricas em memória (implementação original).
 """
-import json
 import threading
-from collections import deque
 import numpy as np
+import orjson
 from src.models.schemas import Metrics
 from src.utils.base_metrics import BaseMetricsExporter
 
 
+def _p95(samples: np.ndarray) -> float:
+    """Linear-interpolated 95th percentile via O(n) selection; partitions samples in place."""
+    position = 0.95 * (len(samples) - 1)
+    lo = int(position)
+    hi = min(lo + 1, len(samples) - 1)
+    samples.partition((lo, hi))
+    return float(samples[lo] + (samples[hi] - samples[lo]) * (position - lo))
+
+
+def _summarize(avg_ns: float | None, samples_ns: np.ndarray) -> Metrics:
+    """Builds millisecond Metrics from a window snapshot; p95 is computed outside the lock."""
+    if avg_ns is None:
+        return Metrics(avg=None, p95=None)
+    return Metrics(avg=avg_ns / 1_000_000, p95=_p95(samples_ns) / 1_000_000)
+
+
+class _LatencyWindow:
+    """Fixed-size numpy ring buffer of nanosecond latencies with an exact O(1) running sum."""
+
+    __slots__ = ("_buf", "_idx", "_count", "_sum", "generation", "summary")
+
+    def __init__(self, max_samples: int):
+        self._buf = np.empty(max_samples, dtype=np.int64)
+        self._idx = 0
+        self._count = 0
+        self._sum = 0
+        # Bumped on every change; summary caches (generation, Metrics) for idle scrapes
+        self.generation = 0
+        self.summary: tuple[int, Metrics] | None = None
+
+    def append(self, latency_ns: int) -> None:
+        """Stores a sample, overwriting the oldest once the window is full."""
+        if self._count == len(self._buf):
+            self._sum -= int(self._buf[self._idx])
+        else:
+            self._count += 1
+        self._buf[self._idx] = latency_ns
+        self._sum += latency_ns
+        self.generation += 1
+        self._idx += 1
+        if self._idx == len(self._buf):
+            self._idx = 0
+
+    def extend(self, latencies_ns: np.ndarray) -> None:
+        """Stores a batch of samples with at most two slice copies into the ring."""
+        batch = np.asarray(latencies_ns, dtype=np.int64).ravel()
+        if batch.size == 0:
+            return
+        size = len(self._buf)
+        if batch.size >= size:
+            batch = batch[-size:]
+        head = min(batch.size, size - self._idx)
+        self._buf[self._idx:self._idx + head] = batch[:head]
+        self._buf[:batch.size - head] = batch[head:]
+        if self._count + batch.size > size:
+            # Evicted samples are scattered across the ring; re-sum instead of subtracting
+            self._count = size
+            self._sum = int(self._buf.sum())
+        else:
+            self._count += batch.size
+            self._sum += int(batch.sum())
+        self._idx = (self._idx + batch.size) % size
+        self.generation += 1
+
+    def snapshot(self) -> tuple[float | None, np.ndarray]:
+        """Returns the O(1) running mean and a copy of the samples in the window, in ns."""
+        if self._count == 0:
+            return None, self._buf[:0]
+        return self._sum / self._count, self._buf[:self._count].copy()
+
+    def clear(self) -> None:
+        """Drops every sample."""
+        self._idx = 0
+        self._count = 0
+        self._sum = 0
+        self.generation += 1
+
+
 class MemoryMetricsExporter(BaseMetricsExporter):
     """Store and export metrics in memory."""
 
+    __slots__ = (
+        "_training_latencies", "_inference_latencies", "_model_cache_hits",
+        "_model_cache_misses", "_coalesced_trainings", "_inference_batches",
+        "_inference_batch_points", "_export_cache", "_lock",
+    )
+
     def __init__(self, max_samples: int = 10000):
-        self._training_latencies: deque = deque(maxlen=max_samples)
-        self._inference_latencies: deque = deque(maxlen=max_samples)
+        self._training_latencies = _LatencyWindow(max_samples)
+        self._inference_latencies = _LatencyWindow(max_samples)
+        self._model_cache_hits = 0
+        self._model_cache_misses = 0
+        self._coalesced_trainings = 0
+        self._inference_batches = 0
+        self._inference_batch_points = 0
+        # (recorded state, JSON) of the last export; any record or reset changes the state
+        self._export_cache: tuple[tuple, str] | None = None
         self._lock = threading.Lock()
 
     def record_training_latency(self, latency_ms: float):
-        with self._lock:
-            self._training_latencies.append(latency_ms)
+        self.record_training_latency_ns(round(latency_ms * 1_000_000))
 
     def record_inference_latency(self, latency_ms: float):
+        self.record_inference_latency_ns(round(latency_ms * 1_000_000))
+
+    def record_training_latency_ns(self, latency_ns: int):
         with self._lock:
-            self._inference_latencies.append(latency_ms)
+            self._training_latencies.append(latency_ns)
 
-    def get_training_metrics(self) -> Metrics:
+    def record_inference_latency_ns(self, latency_ns: int):
         with self._lock:
-            if not self._training_latencies:
-                return Metrics(avg=None, p95=None)
-            snapshot = list(self._training_latencies)
+            self._inference_latencies.append(latency_ns)
 
-        return Metrics(
-            avg=float(np.mean(snapshot)),
-            p95=float(np.percentile(snapshot, 95))
-        )
+    def record_training_latencies(self, latencies_ms: np.ndarray):
+        latencies_ns = np.rint(np.asarray(latencies_ms, dtype=np.float64) * 1_000_000)
+        with self._lock:
+            self._training_latencies.extend(latencies_ns)
 
-    def get_inference_metrics(self) -> Metrics:
+    def record_inference_latencies(self, latencies_ms: np.ndarray):
+        latencies_ns = np.rint(np.asarray(latencies_ms, dtype=np.float64) * 1_000_000)
         with self._lock:
-            if not self._inference_latencies:
-                return Metrics(avg=None, p95=None)
-            snapshot = list(self._inference_latencies)
+            self._inference_latencies.extend(latencies_ns)
 
-        return Metrics(
-            avg=float(np.mean(snapshot)),
-            p95=float(np.percentile(snapshot, 95))
-        )
+    def record_model_cache_access(self, hit: bool):
+        with self._lock:
+            if hit:
+                self._model_cache_hits += 1
+            else:
+                self._model_cache_misses += 1
+
+    def record_inference_batch_size(self, size: int):
+        with self._lock:
+            self._inference_batches += 1
+            self._inference_batch_points += size
+
+    def record_coalesced_training(self):
+        with self._lock:
+            self._coalesced_trainings += 1
+
+    def _window_metrics(self, window: _LatencyWindow) -> Metrics:
+        """Summarizes a window, reusing the last result while no sample has been recorded."""
+        with self._lock:
+            generation = window.generation
+            if window.summary is not None and window.summary[0] == generation:
+                return window.summary[1]
+            avg, samples = window.snapshot()
+        metrics = _summarize(avg, samples)
+        with self._lock:
+            if window.generation == generation:
+                window.summary = (generation, metrics)
+        return metrics
+
+    def get_training_metrics(self) -> Metrics:
+        return self._window_metrics(self._training_latencies)
+
+    def get_inference_metrics(self) -> Metrics:
+        return self._window_metrics(self._inference_latencies)
 
     def export(self) -> str:
         """Exporta métricas em formato JSON."""
+        with self._lock:
+            cache_hits, cache_misses = self._model_cache_hits, self._model_cache_misses
+            coalesced = self._coalesced_trainings
+            batches, batch_points = self._inference_batches, self._inference_batch_points
+            state = (
+                self._training_latencies.generation, self._inference_latencies.generation,
+                cache_hits, cache_misses, coalesced, batches, batch_points,
+            )
+            if self._export_cache is not None and self._export_cache[0] == state:
+                return self._export_cache[1]
+
         training = self.get_training_metrics()
         inference = self.get_inference_metrics()
-
-        return json.dumps({
+        exported = orjson.dumps({
             "training": {
                 "avg_latency_ms": training.avg,
-                "p95_latency_ms": training.p95
+                "p95_latency_ms": training.p95,
+                "coalesced_total": coalesced
             },
             "inference": {
                 "avg_latency_ms": inference.avg,
-                "p95_latency_ms": inference.p95
+                "p95_latency_ms": inference.p95,
+                "batches": batches,
+                "avg_batch_size": batch_points / batches if batches else None
+            },
+            "model_cache": {
+                "hits": cache_hits,
+                "misses": cache_misses
             }
-        }, indent=2)
+        }, option=orjson.OPT_INDENT_2).decode()
+
+        with self._lock:
+            self._export_cache = (state, exported)
+        return exported
 
     def reset(self):
         with self._lock:
             self._training_latencies.clear()
             self._inference_latencies.clear()
+            self._model_cache_hits = 0
+            self._model_cache_misses = 0
+            self._coalesced_trainings = 0
+            self._inference_batches = 0
+            self._inference_batch_points = 0
@@ -9,11 +9,16 @@ from src.utils.prometheus_metrics import PrometheusMetricsExporter
 class MetricsFactory:  # pylint: disable=too-few-public-methods
     """Creates metrics exporter based on configuration."""
 
+    _registry = {
+        "memory": MemoryMetricsExporter,
+        "prometheus": PrometheusMetricsExporter,
+    }
+
     @classmethod
     def create(cls, metrics_type: str, **kwargs) -> BaseMetricsExporter:
         """Instantiates exporter by type."""
-        if metrics_type == "memory":
-            return MemoryMetricsExporter(**kwargs)
-        if metrics_type == "prometheus":
-            return PrometheusMetricsExporter(**kwargs)
-        raise ValueError(f"Metrics type '{metrics_type}' not supported")
+        exporter_class = cls._registry.get(metrics_type)
+        if exporter_class is None:
+            raise ValueError(f"Metrics type '{metrics_type}' not supported")
+
+        return exporter_class(**kwargs)
@@ -8,11 +8,18 @@ from src.utils.base_metrics import BaseMetricsExporter
 class PrometheusMetricsExporter(BaseMetricsExporter):
     """Mock exporter for Prometheus format."""
 
+    # Mock: also list the histogram and counter attributes below once they are real
+    __slots__ = ("namespace",)
+
     def __init__(self, namespace: str = "anomaly_detection"):
         self.namespace = namespace
         # Mock: from prometheus_client import Counter, Histogram
         # Mock: self.training_latency_hist = Histogram(f'{namespace}_training_latency_ms', ...)
         # Mock: self.inference_latency_hist = Histogram(f'{namespace}_inference_latency_ms', ...)
+        # Mock: self.batch_size_hist = Histogram(f'{namespace}_inference_batch_size', ...)
+        # Mock: self.coalesced_counter = Counter(f'{namespace}_coalesced_trains_total', ...)
+        # Mock: self.model_cache_counter = Counter(
+        # Mock:     f'{namespace}_model_cache_total', ..., ['result'])
 
     def record_training_latency(self, latency_ms: float):
         """Simulates recording in Prometheus histogram."""
@@ -22,6 +29,18 @@ class PrometheusMetricsExporter(BaseMetricsExporter):
         """Simulates recording in Prometheus histogram."""
         # Mock: self.inference_latency_hist.observe(latency_ms)
 
+    def record_model_cache_access(self, hit: bool):
+        """Simulates counting a model cache hit or miss in Prometheus."""
+        # Mock: self.model_cache_counter.labels(result="hit" if hit else "miss").inc()
+
+    def record_inference_batch_size(self, size: int):
+        """Simulates recording in Prometheus histogram."""
+        # Mock: self.batch_size_hist.observe(size)
+
+    def record_coalesced_training(self):
+        """Simulates counting a coalesced training in Prometheus."""
+        # Mock: self.coalesced_counter.inc()
+
     def get_training_metrics(self) -> Metrics:
         """Gets aggregated metrics (from Prometheus)."""
         # Mock: buscar do prometheus client
@@ -3,6 +3,8 @@ import time
 
 BASE_URL = "http://127.0.0.1:8000"
 SERIES_ID = "sensor-001"
+# One keep-alive connection for every call instead of a new socket per request
+SESSION = requests.Session()
 
 def test_api():
     """
@@ -17,7 +19,7 @@ def test_api():
         "values": [10.1, 10.2, 9.9, 10.0, 10.3, 9.8, 10.1, 10.2, 10.0, 9.9]
     }
     try:
-        train_response = requests.post(f"{BASE_URL}/fit/{SERIES_ID}", json=train_data)
+        train_response = SESSION.post(f"{BASE_URL}/fit/{SERIES_ID}", json=train_data)
         train_response.raise_for_status()
         print("Train request successful:")
         print(train_response.json())
@@ -33,7 +35,7 @@ def test_api():
         "value": 10.1
     }
     try:
-        predict_response_normal = requests.post(
+        predict_response_normal = SESSION.post(
             f"{BASE_URL}/predict/{SERIES_ID}",
             json=predict_data_normal
         )
@@ -51,7 +53,7 @@ def test_api():
         "value": 50.0
     }
     try:
-        predict_response_anomaly = requests.post(
+        predict_response_anomaly = SESSION.post(
             f"{BASE_URL}/predict/{SERIES_ID}",
             json=predict_data_anomaly
         )
@@ -65,7 +67,7 @@ def test_api():
     if model_version:
         print(f"\n[4] Predicting using specific version: {model_version}")
         try:
-            predict_response_versioned = requests.post(
+            predict_response_versioned = SESSION.post(
                 f"{BASE_URL}/predict/{SERIES_ID}?version={model_version}",
                 json=predict_data_normal
             )